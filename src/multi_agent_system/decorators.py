@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import dataclasses
 import functools
+import sys
+
+from typing_extensions import dataclass_transform
 
 
 def once(func):
@@ -41,3 +45,13 @@ def deprecated(message="This function is deprecated"):
             return func(*args, **kwargs)
         return wrapper
     return decorator
+
+
+@dataclass_transform()
+def slotted_dataclass(cls=None, **kwargs):
+    """Dataclass with __slots__ where supported (Python 3.10+)."""
+    if sys.version_info >= (3, 10):
+        kwargs.setdefault("slots", True)
+    if cls is None:
+        return functools.partial(dataclasses.dataclass, **kwargs)
+    return dataclasses.dataclass(cls, **kwargs)
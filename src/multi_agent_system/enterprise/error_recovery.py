@@ -10,8 +10,11 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Callable
 
+from ..id_generator import generate_sequential_id
+
 
 class ErrorSeverity(Enum):
     """Error severity levels."""
@@ -47,7 +50,7 @@ class RecoveryStrategy(Enum):
 @dataclass
 class ErrorRecord:
     """Record of an error occurrence."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=generate_sequential_id)
     error_id: str = ""  # Unique error identifier
     category: ErrorCategory = ErrorCategory.UNKNOWN
     severity: ErrorSeverity = ErrorSeverity.ERROR
@@ -104,6 +107,11 @@ class FallbackConfig:
     max_fallback_attempts: int = 1
 
 
+# Severity tokens, checked in order of precedence
+_CRITICAL_TOKENS = ("critical", "fatal")
+_WARNING_TOKENS = ("warning", "warn")
+
+
 class ErrorClassifier:
     """Classifies errors and suggests recovery strategies."""
 
@@ -140,6 +148,10 @@ class ErrorClassifier:
             ErrorSeverity.WARNING: 0.3,
             ErrorSeverity.INFO: 0.1,
         }
+        # Results depend only on the message and PATTERNS; cleared in classify
+        # when PATTERNS is replaced on the instance
+        self._classify_message = lru_cache(maxsize=2048)(self._classify_text)
+        self._cached_patterns = self.PATTERNS
 
     def classify(self, error: Exception | str) -> tuple[ErrorCategory, ErrorSeverity]:
         """Classify an error.
@@ -150,24 +162,25 @@ class ErrorClassifier:
         Returns:
             Tuple of (category, severity)
         """
-        # Convert to string
-        error_str = str(error).lower()
+        if self.PATTERNS is not self._cached_patterns:
+            self._classify_message.cache_clear()
+            self._cached_patterns = self.PATTERNS
+        return self._classify_message(str(error).lower())
 
+    def _classify_text(self, error_str: str) -> tuple[ErrorCategory, ErrorSeverity]:
+        """Classify a lowercased error message."""
         # Match patterns
         category = ErrorCategory.UNKNOWN
         for cat, patterns in self.PATTERNS.items():
-            for pattern in patterns:
-                if pattern in error_str:
-                    category = cat
-                    break
-            if category != ErrorCategory.UNKNOWN:
+            if any(pattern in error_str for pattern in patterns):
+                category = cat
                 break
 
         # Determine severity
         severity = ErrorSeverity.ERROR
-        if "critical" in error_str or "fatal" in error_str:
+        if any(token in error_str for token in _CRITICAL_TOKENS):
             severity = ErrorSeverity.CRITICAL
-        elif "warning" in error_str or "warn" in error_str:
+        elif any(token in error_str for token in _WARNING_TOKENS):
             severity = ErrorSeverity.WARNING
 
         return category, severity
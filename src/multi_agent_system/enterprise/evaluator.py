@@ -5,14 +5,28 @@ Reference: "IntellAgent: A Multi-Agent Framework for Evaluating Conversational A
 
 from __future__ import annotations
 
+import atexit
 import json
+import re
 import time
+import weakref
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+# Evaluation index retention and how many saves to batch between index writes
+_INDEX_MAX_IDS = 1000
+_INDEX_FLUSH_INTERVAL = 50
+
+# Keywords that flag a response as potentially unsafe
+_SAFETY_RE = re.compile(r"harmful|illegal|dangerous|hate", re.IGNORECASE)
+
+# Display labels for conversation roles; anything else renders as assistant
+_ROLE_LABELS = {"user": "User", "assistant": "Assistant"}
+
 
 class MetricType(Enum):
     """Evaluation metric types."""
@@ -62,6 +76,19 @@ class EvaluationMetrics:
             "average": self.average(),
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EvaluationMetrics":
+        # "average" is derived, so it is written by to_dict but not read back
+        return cls(
+            relevance=data.get("relevance", 0.0),
+            accuracy=data.get("accuracy", 0.0),
+            completeness=data.get("completeness", 0.0),
+            coherence=data.get("coherence", 0.0),
+            safety=data.get("safety", 1.0),
+            task_completion=data.get("task_completion", 0.0),
+            response_time_ms=data.get("response_time_ms", 0.0),
+        )
+
 
 @dataclass
 class EvaluationResult:
@@ -113,6 +140,13 @@ class Conversation:
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
     metadata: dict[str, Any] = field(default_factory=dict)
+    _last_assistant_idx: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        for idx in range(len(self.turns) - 1, -1, -1):
+            if self.turns[idx].role == "assistant":
+                self._last_assistant_idx = idx
+                break
 
     def add_turn(self, role: str, content: str, metadata: dict | None = None) -> None:
         """Add a turn to conversation."""
@@ -126,22 +160,35 @@ class Conversation:
             metadata=metadata or {},
         )
         self.turns.append(turn)
+        if role == "assistant":
+            self._last_assistant_idx = len(self.turns) - 1
         self.updated_at = datetime.now().isoformat()
 
     def get_last_response(self) -> str:
         """Get last assistant response."""
-        for turn in reversed(self.turns):
-            if turn.role == "assistant":
-                return turn.content
+        if self._last_assistant_idx >= 0:
+            return self.turns[self._last_assistant_idx].content
         return ""
 
     def get_context(self, max_turns: int = 5) -> str:
         """Get recent context."""
-        context_parts = []
-        for turn in self.turns[-max_turns:]:
-            role = "User" if turn.role == "user" else "Assistant"
-            context_parts.append(f"{role}: {turn.content}")
-        return "\n".join(context_parts)
+        # Slice rather than count from the end so max_turns=0 keeps all turns
+        return "\n".join(
+            f"{_ROLE_LABELS.get(turn.role, 'Assistant')}: {turn.content}"
+            for turn in self.turns[-max_turns:]
+        )
+
+
+# Evaluation systems whose pending index updates are written at exit. Held
+# weakly so registering for the flush does not keep a system alive.
+_open_systems: weakref.WeakSet[EvaluationSystem] = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_systems() -> None:
+    """Write pending index updates of all open evaluation systems."""
+    for system in list(_open_systems):
+        system._flush_index()
 
 
 class EvaluationSystem:
@@ -154,33 +201,37 @@ class EvaluationSystem:
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self.evaluations: list[EvaluationResult] = []
+        self._index_file = self.storage_path / "index.json"
+        self._recent_ids: deque[str] = deque(maxlen=_INDEX_MAX_IDS)
+        self._unflushed = 0
+        if self._index_file.exists():
+            with open(self._index_file) as f:
+                self._recent_ids.extend(json.load(f))
         self._load_recent()
+        _open_systems.add(self)
 
     def _load_recent(self, limit: int = 100) -> None:
         """Load recent evaluations."""
-        index_file = self.storage_path / "index.json"
-        if index_file.exists():
-            with open(index_file) as f:
-                ids = json.load(f)
-                # Load recent only
-                for eval_id in ids[-limit:]:
-                    eval_file = self.storage_path / f"{eval_id}.json"
-                    if eval_file.exists():
-                        with open(eval_file) as ef:
-                            data = json.load(ef)
-                            result = EvaluationResult(
-                                id=data["id"],
-                                conversation_id=data["conversation_id"],
-                                query=data["query"],
-                                response=data["response"],
-                                metrics=EvaluationMetrics(**data["metrics"]),
-                                overall_score=data["overall_score"],
-                                timestamp=data["timestamp"],
-                                metadata=data.get("metadata", {}),
-                                issues=data.get("issues", []),
-                                suggestions=data.get("suggestions", []),
-                            )
-                            self.evaluations.append(result)
+        ids = list(self._recent_ids)
+        # Load recent only
+        for eval_id in ids[-limit:]:
+            eval_file = self.storage_path / f"{eval_id}.json"
+            if eval_file.exists():
+                with open(eval_file) as ef:
+                    data = json.load(ef)
+                    result = EvaluationResult(
+                        id=data["id"],
+                        conversation_id=data["conversation_id"],
+                        query=data["query"],
+                        response=data["response"],
+                        metrics=EvaluationMetrics.from_dict(data["metrics"]),
+                        overall_score=data["overall_score"],
+                        timestamp=data["timestamp"],
+                        metadata=data.get("metadata", {}),
+                        issues=data.get("issues", []),
+                        suggestions=data.get("suggestions", []),
+                    )
+                    self.evaluations.append(result)
 
     def evaluate(
         self,
@@ -256,18 +307,13 @@ class EvaluationSystem:
             metrics.completeness = min(1.0, len(response) / 100)
 
         # 4. Coherence (basic sentence check)
-        sentences = response.split(".")
-        if len(sentences) > 1:
+        if "." in response:
             metrics.coherence = 0.9  # Multiple sentences
         else:
             metrics.coherence = 0.7  # Single sentence
 
         # 5. Safety (basic checks)
-        safety_keywords = ["harmful", "illegal", "dangerous", "hate"]
-        if any(kw in response.lower() for kw in safety_keywords):
-            metrics.safety = 0.3
-        else:
-            metrics.safety = 1.0
+        metrics.safety = 0.3 if _SAFETY_RE.search(response) else 1.0
 
         # 6. Task completion
         if expected:
@@ -320,15 +366,30 @@ class EvaluationSystem:
         with open(eval_file, "w") as f:
             json.dump(result.to_dict(), f, indent=2)
 
-        # Update index
-        index_file = self.storage_path / "index.json"
-        ids = []
-        if index_file.exists():
-            with open(index_file) as f:
-                ids = json.load(f)
-        ids.append(result.id)
-        with open(index_file, "w") as f:
-            json.dump(ids[-1000:], f)  # Keep last 1000
+        # Update index in memory, writing it out in batches
+        self._recent_ids.append(result.id)
+        self._unflushed += 1
+        if self._unflushed >= _INDEX_FLUSH_INTERVAL:
+            self._flush_index()
+
+    def _flush_index(self) -> None:
+        """Write pending index updates to disk."""
+        if not self._unflushed:
+            return
+        with open(self._index_file, "w") as f:
+            json.dump(list(self._recent_ids), f)
+        self._unflushed = 0
+
+    def close(self) -> None:
+        """Write pending index updates and stop tracking this system for the exit flush."""
+        self._flush_index()
+        _open_systems.discard(self)
+
+    def __del__(self) -> None:
+        # Systems are only held weakly for the exit flush, so one dropped
+        # without close() writes its pending index updates here
+        if getattr(self, "_unflushed", 0):
+            self._flush_index()
 
     def compare(
         self,
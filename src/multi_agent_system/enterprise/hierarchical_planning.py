@@ -7,10 +7,14 @@ multi-level task decomposition and execution.
 from __future__ import annotations
 
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable
+from itertools import chain
+from typing import Any, Callable, Iterator
+
+from ..decorators import slotted_dataclass
+from ..id_generator import generate_hex_id
 
 
 class PlanLevel(Enum):
@@ -29,10 +33,10 @@ class PlanStatus(Enum):
     PAUSED = "paused"
 
 
-@dataclass
+@slotted_dataclass
 class Goal:
     """A high-level goal."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=generate_hex_id)
     name: str = ""
     description: str = ""
     priority: int = 0  # Higher = more important
@@ -51,10 +55,10 @@ class Goal:
     completed_at: datetime | None = None
 
 
-@dataclass
+@slotted_dataclass
 class Task:
     """A task in the plan."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=generate_hex_id)
     name: str = ""
     description: str = ""
 
@@ -78,7 +82,7 @@ class Task:
     completed_at: datetime | None = None
 
 
-@dataclass
+@slotted_dataclass
 class Plan:
     """A hierarchical plan."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -96,10 +100,19 @@ class Plan:
     # Status
     status: PlanStatus = PlanStatus.PENDING
     progress: float = 0.0
+    version: int = 0  # Bumped whenever tasks are added or change status
+
+    # Task counters, maintained by HierarchicalPlanner
+    total_tasks: int = 0
+    completed_tasks: int = 0
 
     created_at: datetime = field(default_factory=datetime.now)
     completed_at: datetime | None = None
 
+    def iter_tasks(self) -> Iterator[Task]:
+        """Iterate tasks across all levels without copying the lists."""
+        return chain(self.strategic_tasks, self.tactical_tasks, self.execution_tasks)
+
 
 class HierarchicalPlanner:
     """Hierarchical planning system.
@@ -117,6 +130,16 @@ class HierarchicalPlanner:
         self._goals: dict[str, Goal] = {}
         self._tasks: dict[str, Task] = {}
 
+        # Incremental scheduling state (Kahn-style), kept in sync by
+        # set_task_status. Statuses edited directly on tasks are only picked
+        # up after resync().
+        self._task_plan: dict[str, str] = {}  # task id -> plan id
+        self._known_status: dict[str, PlanStatus] = {}  # task id -> last applied status
+        self._in_degree: dict[str, int] = {}  # task id -> unmet dependency count
+        self._dependents: dict[str, dict[str, list[str]]] = {}  # plan id -> task id -> dependent ids
+        self._ready: dict[str, dict[str, None]] = {}  # plan id -> incomplete task ids with deps met
+        self._exec_cache: dict[str, tuple[int, list[Task]]] = {}  # plan id -> (version, tasks)
+
     def create_plan(
         self,
         name: str,
@@ -125,6 +148,8 @@ class HierarchicalPlanner:
         """Create a new plan."""
         plan = Plan(name=name, description=description)
         self._plans[plan.id] = plan
+        self._dependents[plan.id] = {}
+        self._ready[plan.id] = {}
         return plan
 
     def add_goal(
@@ -166,16 +191,166 @@ class HierarchicalPlanner:
             depends_on=depends_on or [],
         )
 
-        if level == PlanLevel.STRATEGIC:
-            plan.strategic_tasks.append(task)
-        elif level == PlanLevel.TACTICAL:
-            plan.tactical_tasks.append(task)
-        else:
-            plan.execution_tasks.append(task)
-
-        self._tasks[task.id] = task
+        self._add_tasks_bulk(plan, level, [task])
         return task
 
+    def _add_tasks_bulk(self, plan: Plan, level: PlanLevel, tasks: list[Task]) -> None:
+        """Add several tasks of the same level to plan in one step."""
+        if level is PlanLevel.STRATEGIC:
+            plan.strategic_tasks.extend(tasks)
+        elif level is PlanLevel.TACTICAL:
+            plan.tactical_tasks.extend(tasks)
+        else:
+            plan.execution_tasks.extend(tasks)
+
+        plan.total_tasks += len(tasks)
+        for task in tasks:
+            self._tasks[task.id] = task
+            self._schedule(plan, task)
+        plan.progress = plan.completed_tasks / plan.total_tasks
+        plan.version += 1
+
+    def _schedule(self, plan: Plan, task: Task) -> None:
+        """Register task dependencies and queue it if already runnable."""
+        self._task_plan[task.id] = plan.id
+        self._known_status[task.id] = task.status
+        dependents = self._dependents[plan.id]
+        unmet = 0
+        for dep in task.depends_on:
+            dependents.setdefault(dep, []).append(task.id)
+            if not (
+                self._task_plan.get(dep) == plan.id
+                and self._known_status[dep] is PlanStatus.COMPLETED
+            ):
+                unmet += 1
+
+        self._in_degree[task.id] = unmet
+        if task.status is PlanStatus.COMPLETED:
+            plan.completed_tasks += 1
+            # Tasks added earlier may be waiting on this one
+            self._shift_dependents(plan.id, task.id, -1)
+        elif unmet == 0:
+            self._ready[plan.id][task.id] = None
+
+    def _shift_dependents(self, plan_id: str, task_id: str, delta: int) -> None:
+        """Adjust unmet dependency counts of the tasks depending on task_id."""
+        ready = self._ready[plan_id]
+        for child_id in self._dependents[plan_id].get(task_id, ()):
+            self._in_degree[child_id] += delta
+            if delta > 0:
+                ready.pop(child_id, None)
+            elif (
+                self._in_degree[child_id] == 0
+                and self._known_status[child_id] is not PlanStatus.COMPLETED
+            ):
+                ready[child_id] = None
+
+    def resync(self, plan_id: str) -> bool:
+        """Reschedule plan from its tasks after they were changed directly.
+
+        Only needed when Task.status was assigned, or tasks were added to
+        the plan, without going through the planner.
+
+        Args:
+            plan_id: Plan to reschedule
+
+        Returns:
+            True if plan was found
+        """
+        plan = self._plans.get(plan_id)
+        if not plan:
+            return False
+
+        self._rebuild(plan, list(plan.iter_tasks()))
+        return True
+
+    def _rebuild(self, plan: Plan, tasks: list[Task]) -> None:
+        """Recompute counters and scheduling state of plan from its tasks."""
+        completed = {task.id for task in tasks if task.status is PlanStatus.COMPLETED}
+        dependents: dict[str, list[str]] = {}
+        ready: dict[str, None] = {}
+        for task in tasks:
+            self._tasks[task.id] = task
+            self._task_plan[task.id] = plan.id
+            self._known_status[task.id] = task.status
+            unmet = 0
+            for dep in task.depends_on:
+                dependents.setdefault(dep, []).append(task.id)
+                if dep not in completed:
+                    unmet += 1
+            self._in_degree[task.id] = unmet
+            if unmet == 0 and task.status is not PlanStatus.COMPLETED:
+                ready[task.id] = None
+
+        self._dependents[plan.id] = dependents
+        self._ready[plan.id] = ready
+        plan.total_tasks = len(tasks)
+        plan.completed_tasks = len(completed)
+        plan.progress = len(completed) / len(tasks) if tasks else 0.0
+        plan.version += 1
+
+    def set_task_status(self, task_id: str, status: PlanStatus) -> bool:
+        """Change task status, keeping plan counters and scheduling in sync.
+
+        Args:
+            task_id: Task to update
+            status: New status
+
+        Returns:
+            True if task was found
+        """
+        task = self._tasks.get(task_id)
+        if not task:
+            return False
+
+        if task.status is not status:
+            if status is PlanStatus.IN_PROGRESS:
+                task.started_at = datetime.now()
+            elif status is PlanStatus.COMPLETED:
+                task.completed_at = datetime.now()
+            task.status = status
+
+        # Counters follow the status the planner last applied, which may
+        # differ from task.status if it was edited directly
+        previous = self._known_status[task_id]
+        if previous is status:
+            return True
+
+        plan_id = self._task_plan[task_id]
+        plan = self._plans[plan_id]
+        self._known_status[task_id] = status
+        if status is PlanStatus.COMPLETED:
+            plan.completed_tasks += 1
+            self._ready[plan_id].pop(task_id, None)
+            self._shift_dependents(plan_id, task_id, -1)
+        elif previous is PlanStatus.COMPLETED:
+            plan.completed_tasks -= 1
+            if self._in_degree[task_id] == 0:
+                self._ready[plan_id][task_id] = None
+            self._shift_dependents(plan_id, task_id, 1)
+        plan.progress = plan.completed_tasks / plan.total_tasks
+        plan.version += 1
+
+        return True
+
+    def mark_completed(self, task_id: str, result: Any = None) -> bool:
+        """Mark task as completed and release tasks that depend on it.
+
+        Args:
+            task_id: Task to complete
+            result: Optional task result
+
+        Returns:
+            True if task was found
+        """
+        task = self._tasks.get(task_id)
+        if not task:
+            return False
+
+        if result is not None:
+            task.result = result
+        return self.set_task_status(task_id, PlanStatus.COMPLETED)
+
     def decompose_goal(
         self,
         goal_id: str,
@@ -186,24 +361,25 @@ class HierarchicalPlanner:
         if not goal:
             return None
 
+        plan = self._plans.get(plan_id)
+        if not plan:
+            return []
+
         # Create tactical task for goal
-        tactical = self.add_task(
-            plan_id,
-            f"Tactical: {goal.name}",
-            PlanLevel.TACTICAL,
-        )
+        tactical = Task(name=f"Tactical: {goal.name}", level=PlanLevel.TACTICAL)
+        self._add_tasks_bulk(plan, PlanLevel.TACTICAL, [tactical])
 
         # Create execution tasks
-        tasks = []
-        for i in range(3):  # Simplified - would use LLM in real impl
-            exec_task = self.add_task(
-                plan_id,
-                f"Execute: {goal.name} - Step {i+1}",
-                PlanLevel.EXECUTION,
-                depends_on=[tactical.id] if tactical else [],
+        # Simplified - would use LLM in real impl
+        tasks = [
+            Task(
+                name=f"Execute: {goal.name} - Step {i+1}",
+                level=PlanLevel.EXECUTION,
+                depends_on=[tactical.id],
             )
-            if exec_task:
-                tasks.append(exec_task)
+            for i in range(3)
+        ]
+        self._add_tasks_bulk(plan, PlanLevel.EXECUTION, tasks)
 
         return tasks
 
@@ -211,44 +387,42 @@ class HierarchicalPlanner:
         self,
         plan_id: str,
     ) -> list[Task]:
-        """Get tasks ready to execute."""
+        """Get tasks ready to execute.
+
+        Tasks are released as their dependencies complete via
+        set_task_status, so no scan of the plan is needed. Results are
+        reused until the plan version changes.
+        """
         plan = self._plans.get(plan_id)
         if not plan:
             return []
 
-        all_tasks = (
-            plan.strategic_tasks +
-            plan.tactical_tasks +
-            plan.execution_tasks
-        )
-
-        executable = []
-        completed = {t.id for t in all_tasks if t.status == PlanStatus.COMPLETED}
+        cached = self._exec_cache.get(plan_id)
+        if cached and cached[0] == plan.version:
+            return list(cached[1])
 
-        for task in all_tasks:
-            if task.status == PlanStatus.PENDING:
-                if all(dep in completed for dep in task.depends_on):
-                    executable.append(task)
+        executable = [
+            self._tasks[task_id] for task_id in self._ready[plan_id]
+            if self._tasks[task_id].status is PlanStatus.PENDING
+        ]
 
-        return executable
+        self._exec_cache[plan_id] = (plan.version, executable)
+        return list(executable)
 
     def update_progress(self, plan_id: str) -> float:
-        """Update plan progress."""
+        """Update plan progress.
+
+        Counts are maintained by set_task_status; call resync() first if
+        statuses were edited directly on tasks.
+        """
         plan = self._plans.get(plan_id)
         if not plan:
             return 0.0
 
-        all_tasks = (
-            plan.strategic_tasks +
-            plan.tactical_tasks +
-            plan.execution_tasks
-        )
-
-        if not all_tasks:
+        if not plan.total_tasks:
             return 0.0
 
-        completed = sum(1 for t in all_tasks if t.status == PlanStatus.COMPLETED)
-        plan.progress = completed / len(all_tasks)
+        plan.progress = plan.completed_tasks / plan.total_tasks
 
         return plan.progress
 
@@ -5,12 +5,25 @@ Provides user intent recognition and classification for agent interactions.
 
 from __future__ import annotations
 
-import uuid
-from dataclasses import dataclass, field
+import re
+from dataclasses import field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
+from ..decorators import slotted_dataclass
+from ..id_generator import generate_hex_id
+
+# Entity extraction patterns
+_NUM_RE = re.compile(r'\d+')
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+_WORD_RE = re.compile(r'\w+')
+
+# Time words in ascending precedence; the last one present wins
+_TIME_WORDS = ("today", "tomorrow", "yesterday", "now", "later")
+_TIME_WORD_SET = frozenset(_TIME_WORDS)
+
 
 class IntentType(Enum):
     """Intent types."""
@@ -23,10 +36,10 @@ class IntentType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@slotted_dataclass
 class Intent:
     """Recognized intent."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=generate_hex_id)
     intent_type: IntentType = IntentType.UNKNOWN
 
     # Classification
@@ -44,10 +57,10 @@ class Intent:
     processed_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@slotted_dataclass
 class IntentPattern:
     """Pattern for intent matching."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=generate_hex_id)
     intent_type: IntentType = IntentType.UNKNOWN
     category: str = ""
 
@@ -73,6 +86,10 @@ class IntentRecognizer:
     def __init__(self) -> None:
         """Initialize intent recognizer."""
         self._patterns: list[IntentPattern] = []
+        self._regexes: dict[str, list[re.Pattern[str]]] = {}  # pattern id -> compiled regex
+        self._keyword_index: dict[str, list[int]] = {}  # lowercased keyword -> pattern indices
+        # Scores depend only on the text and pattern set; cleared in add_pattern
+        self._score = lru_cache(maxsize=4096)(self._score_text)
         self._load_defaults()
 
     def _load_defaults(self) -> None:
@@ -118,25 +135,30 @@ class IntentRecognizer:
                 keywords=["hello", "hi", "hey", "good morning", "good evening"],
             ),
         ]
+        for idx, pattern in enumerate(self._patterns):
+            self._index_pattern(idx, pattern)
+
+    def _index_pattern(self, idx: int, pattern: IntentPattern) -> None:
+        """Precompile pattern regexes and index its keywords.
+
+        Keywords shared by several patterns are then scanned once per text.
+        """
+        self._regexes[pattern.id] = [re.compile(regex) for regex in pattern.regex]
+        for keyword in pattern.keywords:
+            self._keyword_index.setdefault(keyword.lower(), []).append(idx)
 
     def add_pattern(self, pattern: IntentPattern) -> None:
         """Add intent pattern."""
         self._patterns.append(pattern)
+        self._index_pattern(len(self._patterns) - 1, pattern)
+        self._score.cache_clear()
 
     def recognize(self, text: str) -> Intent:
         """Recognize intent from text."""
         text_lower = text.lower()
 
-        # Check each pattern
-        best_match = None
-        best_score = 0.0
-
-        for pattern in self._patterns:
-            score = self._match_pattern(text_lower, pattern)
-
-            if score > best_score:
-                best_score = score
-                best_match = pattern
+        best_idx, best_score = self._score(text_lower)
+        best_match = self._patterns[best_idx] if best_idx >= 0 else None
 
         # Create intent
         if best_match and best_score > 0.3:
@@ -159,21 +181,54 @@ class IntentRecognizer:
 
         return intent
 
-    def _match_pattern(self, text: str, pattern: IntentPattern) -> float:
-        """Match text against pattern."""
-        score = 0.0
-        matches = 0
+    def _score_text(self, text_lower: str) -> tuple[int, float]:
+        """Score all patterns against text.
 
-        # Check keywords
-        for keyword in pattern.keywords:
-            if keyword.lower() in text:
-                score += 0.4
-                matches += 1
+        Returns:
+            Tuple of (best pattern index or -1, best score)
+        """
+        # Score all patterns in one pass over the keyword index
+        scores = [0.0] * len(self._patterns)
+        matches = [0] * len(self._patterns)
 
+        for keyword, owners in self._keyword_index.items():
+            if keyword in text_lower:
+                for idx in owners:
+                    scores[idx] += 0.4
+                    matches[idx] += 1
+
+        best_idx = -1
+        best_score = 0.0
+
+        for idx, pattern in enumerate(self._patterns):
+            score = self._match_pattern(
+                text_lower, pattern, scores[idx], matches[idx]
+            )
+
+            if score > best_score:
+                best_score = score
+                best_idx = idx
+
+        return best_idx, best_score
+
+    def _match_pattern(
+        self,
+        text: str,
+        pattern: IntentPattern,
+        score: float = 0.0,
+        matches: int = 0,
+    ) -> float:
+        """Match text against pattern regexes and normalize the score.
+
+        Args:
+            text: Lowercased input text
+            pattern: Pattern to match
+            score: Keyword score already accumulated for the pattern
+            matches: Keyword matches already counted for the pattern
+        """
         # Check regex
-        import re
-        for regex in pattern.regex:
-            if re.search(regex, text):
+        for regex in self._regexes[pattern.id]:
+            if regex.search(text):
                 score += 0.5
                 matches += 1
 
@@ -191,24 +246,20 @@ class IntentRecognizer:
         """Extract entities from text."""
         entities = {}
 
-        # Simple entity extraction based on patterns
-        import re
-
         # Extract numbers
-        numbers = re.findall(r'\d+', text)
+        numbers = _NUM_RE.findall(text)
         if numbers:
             entities["numbers"] = numbers
 
         # Extract quoted text
-        quoted = re.findall(r'"([^"]+)"', text)
+        quoted = _QUOTED_RE.findall(text)
         if quoted:
             entities["quoted"] = quoted
 
         # Extract time-related
-        time_words = ["today", "tomorrow", "yesterday", "now", "later"]
-        for word in time_words:
-            if word in text:
-                entities["time"] = word
+        time_hits = _TIME_WORD_SET.intersection(_WORD_RE.findall(text))
+        if time_hits:
+            entities["time"] = next(w for w in reversed(_TIME_WORDS) if w in time_hits)
 
         return entities
 
@@ -5,14 +5,28 @@ Provides short-term and long-term memory capabilities.
 
 from __future__ import annotations
 
-import json
+import heapq
+import math
+import os
 import time
-from dataclasses import dataclass, field
+from array import array
+from collections import deque
+from dataclasses import field
+from itertools import islice
+from operator import attrgetter, mul
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
+from ..decorators import slotted_dataclass
+from ..id_generator import generate_hex_id
+from ..json_utils import dumps, loads
 
-@dataclass
+
+# Rank memories by importance, then recency (use with reverse=True)
+_RANK_KEY = attrgetter("importance", "timestamp")
+
+
+@slotted_dataclass
 class MemoryEntry:
     """A single memory entry."""
 
@@ -56,31 +70,26 @@ class ShortTermMemory:
 
     def __init__(self, max_size: int = 100) -> None:
         self.max_size = max_size
-        self._memories: list[MemoryEntry] = []
+        self._memories: deque[MemoryEntry] = deque(maxlen=max_size)
 
     def store(self, content: str, importance: float = 1.0, metadata: dict | None = None) -> str:
         """Store a new short-term memory."""
-        import uuid
-
         entry = MemoryEntry(
-            id=str(uuid.uuid4())[:12],
+            id=generate_hex_id(6),
             content=content,
             memory_type="short_term",
             importance=importance,
             metadata=metadata or {},
         )
+        # Oldest entries are evicted once max_size is reached
         self._memories.append(entry)
 
-        # Trim if needed
-        if len(self._memories) > self.max_size:
-            self._memories = self._memories[-self.max_size :]
-
         return entry.id
 
     def retrieve(self, query: str | None = None, limit: int = 10) -> list[MemoryEntry]:
         """Retrieve recent memories."""
         if query is None:
-            return self._memories[-limit:]
+            return list(self._memories)[-limit:]
         # Simple keyword matching
         results = [m for m in self._memories if query.lower() in m.content.lower()]
         return results[-limit:]
@@ -88,7 +97,7 @@ class ShortTermMemory:
     def get_context(self, max_tokens: int = 2000) -> str:
         """Get context string for LLM."""
         context_parts = []
-        for memory in reversed(self._memories[-10:]):
+        for memory in islice(reversed(self._memories), 10):
             context_parts.append(f"[{memory.memory_type}] {memory.content}")
         return "\n".join(context_parts[-max_tokens:])
 
@@ -104,30 +113,202 @@ class LongTermMemory:
     """Long-term memory with persistent storage.
 
     Stores user profiles, learned knowledge, and important facts.
+    Entries are appended to a JSONL log; later lines for the same id
+    supersede earlier ones and the log is compacted when mostly stale.
+    Embeddings are kept out of the log in a packed float32 file and
+    loaded on demand via get_embedding. Compaction writes a new
+    embeddings file named in the first line of the new log, so replacing
+    the log switches both files at once.
     """
 
+    # Compact once fewer than half of the logged lines are live entries
+    COMPACT_RATIO = 0.5
+    COMPACT_MIN_LINES = 100
+
     def __init__(self, storage_path: str = "./data/memory") -> None:
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self._log_file = self.storage_path / "entries.jsonl"
+        self._emb_file = self.storage_path / "embeddings.f32"  # Unless named in the log
+        self._embedding_refs: dict[str, tuple[int, int]] = {}  # id -> (offset, dim)
+        # Unit-normalized embeddings for semantic search, built lazily
+        self._emb_matrix: list[tuple[str, array]] | None = None
         self._cache: dict[str, MemoryEntry] = {}
+        self._by_type: dict[str, dict[str, MemoryEntry]] = {}  # memory_type -> entries
+        self._log_lines = 0
         self._load_index()
 
     def _load_index(self) -> None:
         """Load memory index."""
+        if self._log_file.exists():
+            with open(self._log_file, "rb+") as f:
+                offset = 0  # End of the last complete line
+                for line in f:
+                    if line.strip():
+                        try:
+                            entry_data = loads(line)
+                        except ValueError:
+                            if f.read(1):
+                                raise
+                            # Append cut short by a crash; drop it so the
+                            # next append starts on a fresh line
+                            f.truncate(offset)
+                            break
+                        if "embeddings_file" in entry_data:
+                            self._emb_file = self.storage_path / entry_data["embeddings_file"]
+                        else:
+                            ref = entry_data.get("embedding_ref")
+                            if ref:
+                                self._embedding_refs[entry_data["id"]] = (ref[0], ref[1])
+                            self._index(MemoryEntry.from_dict(entry_data))
+                            self._log_lines += 1
+                    offset += len(line)
+                else:
+                    if offset and not line.endswith(b"\n"):
+                        f.write(b"\n")
+            self._remove_stale_embeddings()
+            return
+
+        # Migrate legacy single-file index
         index_file = self.storage_path / "index.json"
         if index_file.exists():
-            with open(index_file) as f:
-                index = json.load(f)
-                # Load metadata only (lazy load content)
+            with open(index_file, "rb") as f:
+                index = loads(f.read())
                 for entry_data in index:
-                    self._cache[entry_data["id"]] = MemoryEntry.from_dict(entry_data)
+                    self._index(MemoryEntry.from_dict(entry_data))
+            self._save_index()
+
+    def _index(self, entry: MemoryEntry) -> None:
+        """Add or replace entry in the cache and its type bucket."""
+        previous = self._cache.get(entry.id)
+        if previous is not None:
+            self._by_type.get(previous.memory_type, {}).pop(entry.id, None)
+        self._cache[entry.id] = entry
+        self._by_type.setdefault(entry.memory_type, {})[entry.id] = entry
+
+    def _serialize(self, entry: MemoryEntry, emb_out: BinaryIO | None) -> bytes:
+        """Serialize entry as a log line, moving its embedding to emb_out."""
+        data = entry.to_dict()
+        del data["embedding"]
+        if entry.embedding is not None and emb_out is not None:
+            vector = array("f", entry.embedding)
+            self._embedding_refs[entry.id] = (emb_out.tell(), len(vector))
+            vector.tofile(emb_out)
+
+        ref = self._embedding_refs.get(entry.id)
+        if ref is not None:
+            data["embedding_ref"] = list(ref)
+        return dumps(data, non_str_keys=True) + b"\n"
 
     def _save_index(self) -> None:
-        """Save memory index."""
-        index_file = self.storage_path / "index.json"
-        index = [entry.to_dict() for entry in self._cache.values()]
-        with open(index_file, "w") as f:
-            json.dump(index, f, indent=2)
+        """Rewrite the log and embeddings with one record per live entry."""
+        tmp_file = self._log_file.with_suffix(".jsonl.tmp")
+        emb_file = self.storage_path / f"embeddings-{generate_hex_id(4)}.f32"
+        old_refs, self._embedding_refs = self._embedding_refs, {}
+        old_emb = open(self._emb_file, "rb") if old_refs else None
+        try:
+            with open(tmp_file, "wb") as f, open(emb_file, "wb") as emb_out:
+                f.write(dumps({"embeddings_file": emb_file.name}) + b"\n")
+                for entry in self._cache.values():
+                    ref = old_refs.get(entry.id)
+                    if entry.embedding is None and ref is not None:
+                        # Copy the stored vector over without decoding it
+                        old_emb.seek(ref[0])
+                        self._embedding_refs[entry.id] = (emb_out.tell(), ref[1])
+                        emb_out.write(old_emb.read(ref[1] * array("f").itemsize))
+                    f.write(self._serialize(entry, emb_out))
+            # The old log and embeddings stay valid until this replace
+            os.replace(tmp_file, self._log_file)
+        except BaseException:
+            self._embedding_refs = old_refs
+            emb_file.unlink(missing_ok=True)
+            raise
+        finally:
+            if old_emb is not None:
+                old_emb.close()
+        self._emb_file = emb_file
+        self._log_lines = len(self._cache)
+        self._remove_stale_embeddings()
+
+    def _remove_stale_embeddings(self) -> None:
+        """Delete embeddings files the log no longer refers to."""
+        for path in self.storage_path.glob("embeddings*.f32"):
+            if path != self._emb_file:
+                path.unlink()
+
+    def _append(self, entry: MemoryEntry) -> None:
+        """Append a new or updated entry to the log."""
+        if entry.embedding is not None:
+            self._emb_matrix = None
+            with open(self._emb_file, "ab") as emb_out:
+                line = self._serialize(entry, emb_out)
+        else:
+            line = self._serialize(entry, None)
+        with open(self._log_file, "ab") as f:
+            f.write(line)
+        self._log_lines += 1
+
+        if (
+            self._log_lines >= self.COMPACT_MIN_LINES
+            and len(self._cache) < self._log_lines * self.COMPACT_RATIO
+        ):
+            self._save_index()
+
+    def get_embedding(self, entry_id: str) -> list[float] | None:
+        """Get entry embedding, reading it from the embeddings file if needed."""
+        entry = self._cache.get(entry_id)
+        if entry is None:
+            return None
+        if entry.embedding is not None:
+            return entry.embedding
+
+        ref = self._embedding_refs.get(entry_id)
+        if ref is None:
+            return None
+        vector = array("f")
+        with open(self._emb_file, "rb") as f:
+            f.seek(ref[0])
+            vector.frombytes(f.read(ref[1] * vector.itemsize))
+        return vector.tolist()
+
+    def _build_emb_matrix(self) -> list[tuple[str, array]]:
+        """Collect unit-normalized embeddings of all entries."""
+        stored = array("f")
+        if self._embedding_refs and self._emb_file.exists():
+            with open(self._emb_file, "rb") as f:
+                stored.frombytes(f.read())
+
+        rows = []
+        for entry in self._cache.values():
+            if entry.embedding is not None:
+                vector = array("f", entry.embedding)
+            elif entry.id in self._embedding_refs:
+                offset, dim = self._embedding_refs[entry.id]
+                start = offset // stored.itemsize
+                vector = stored[start:start + dim]
+            else:
+                continue
+            norm = math.sqrt(sum(map(mul, vector, vector)))
+            if norm:
+                rows.append((entry.id, array("f", [x / norm for x in vector])))
+        return rows
+
+    def retrieve_semantic(self, query_embedding: list[float], limit: int = 10) -> list[MemoryEntry]:
+        """Retrieve memories most similar to an embedding (cosine similarity)."""
+        norm = math.sqrt(sum(map(mul, query_embedding, query_embedding)))
+        if not norm:
+            return []
+        if self._emb_matrix is None:
+            self._emb_matrix = self._build_emb_matrix()
+
+        dim = len(query_embedding)
+        query = [x / norm for x in query_embedding]
+        scored = (
+            (sum(map(mul, vector, query)), entry_id)
+            for entry_id, vector in self._emb_matrix
+            if len(vector) == dim
+        )
+        return [self._cache[entry_id] for _, entry_id in heapq.nlargest(limit, scored)]
 
     def store(
         self,
@@ -135,35 +316,38 @@ class LongTermMemory:
         memory_type: str = "long_term",
         importance: float = 1.0,
         metadata: dict | None = None,
+        embedding: list[float] | None = None,
     ) -> str:
         """Store a long-term memory."""
-        import uuid
-
         entry = MemoryEntry(
-            id=str(uuid.uuid4())[:12],
+            id=generate_hex_id(6),
             content=content,
             memory_type=memory_type,
             importance=importance,
             metadata=metadata or {},
+            embedding=embedding,
         )
-        self._cache[entry.id] = entry
-        self._save_index()
+        self._index(entry)
+        self._append(entry)
         return entry.id
 
     def retrieve(self, query: str | None = None, memory_type: str | None = None, limit: int = 10) -> list[MemoryEntry]:
         """Retrieve long-term memories."""
-        results = list(self._cache.values())
-
-        # Filter by type
+        # Filter by type using the per-type buckets
         if memory_type:
-            results = [m for m in results if m.memory_type == memory_type]
+            candidates = self._by_type.get(memory_type, {}).values()
+        else:
+            candidates = self._cache.values()
 
         # Filter by query (simple contains)
         if query:
-            results = [m for m in results if query.lower() in m.content.lower()]
+            query_lower = query.lower()
+            results = [m for m in candidates if query_lower in m.content.lower()]
+        else:
+            results = list(candidates)
 
         # Sort by importance and time
-        results.sort(key=lambda m: (-m.importance, -m.timestamp))
+        results.sort(key=_RANK_KEY, reverse=True)
 
         return results[:limit]
 
@@ -189,6 +373,7 @@ class LongTermMemory:
             # Update existing
             profile_entry.metadata.update(updates)
             profile_entry.content = str(profile_entry.metadata)
+            self._append(profile_entry)
         else:
             # Create new
             self.store(
@@ -197,7 +382,6 @@ class LongTermMemory:
                 importance=1.0,
                 metadata={"user_id": user_id, **updates},
             )
-        self._save_index()
 
     def __len__(self) -> int:
         return len(self._cache)
@@ -224,7 +408,7 @@ class MemorySystem:
                 st_results = self.short_term.retrieve(query, limit)
                 lt_results = self.long_term.retrieve(query, None, limit)
                 combined = st_results + lt_results
-                combined.sort(key=lambda m: (-m.importance, -m.timestamp))
+                combined.sort(key=_RANK_KEY, reverse=True)
                 return combined[:limit]
             return self.short_term.retrieve(query, limit)
         return self.long_term.retrieve(query, memory_type, limit)
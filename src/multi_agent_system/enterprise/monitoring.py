@@ -5,14 +5,21 @@ Provides real-time monitoring of agent behavior, performance, and health.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import time
-from dataclasses import dataclass, field
+from bisect import bisect_right
+from collections import deque
+from dataclasses import field, replace
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from ..decorators import slotted_dataclass
+from ..id_generator import generate_sequential_id
+from ..json_utils import dumps
+
 
 class MetricType(Enum):
     """Types of metrics."""
@@ -35,7 +42,12 @@ class AgentStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Health score lower bounds for each status above UNHEALTHY
+_SCORE_THRESHOLDS = (0.5, 0.8)
+_SCORE_STATUSES = (AgentStatus.UNHEALTHY, AgentStatus.DEGRADED, AgentStatus.HEALTHY)
+
+
+@slotted_dataclass
 class AgentMetrics:
     """Metrics for a single agent."""
 
@@ -49,6 +61,29 @@ class AgentMetrics:
     cache_hits: int = 0
     last_request_time: float = 0.0
 
+    def record(
+        self,
+        success: bool,
+        response_time_ms: float,
+        tokens: int = 0,
+        cost: float = 0.0,
+        cache_hit: bool = False,
+        timestamp: float | None = None,
+    ) -> None:
+        """Accumulate a single request into the counters.
+
+        Args:
+            timestamp: Request time in seconds; read from the clock if None
+        """
+        self.total_requests += 1
+        self.successful_requests += success
+        self.failed_requests += not success
+        self.total_response_time_ms += response_time_ms
+        self.total_tokens += tokens
+        self.total_cost += cost
+        self.cache_hits += cache_hit
+        self.last_request_time = time.time() if timestamp is None else timestamp
+
     @property
     def success_rate(self) -> float:
         if self.total_requests == 0:
@@ -72,7 +107,7 @@ class AgentMetrics:
         return self.cache_hits / self.total_requests
 
 
-@dataclass
+@slotted_dataclass
 class AgentHealth:
     """Health status of an agent."""
 
@@ -84,16 +119,25 @@ class AgentHealth:
     metrics: dict[str, float] = field(default_factory=dict)
 
 
-@dataclass
+@slotted_dataclass
 class MonitoringEvent:
     """A monitoring event."""
 
     event_id: str
     event_type: str
     agent_name: str
-    timestamp: str
+    timestamp: int  # Nanoseconds since epoch, formatted only on output
     data: dict[str, Any] = field(default_factory=dict)
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "event_id": self.event_id,
+            "event_type": self.event_type,
+            "agent_name": self.agent_name,
+            "timestamp": datetime.fromtimestamp(self.timestamp / 1e9).isoformat(),
+            "data": self.data,
+        }
+
 
 class AgentMonitor:
     """Real-time monitoring for multi-agent systems.
@@ -101,13 +145,25 @@ class AgentMonitor:
     Tracks agent performance, health, and behavior.
     """
 
-    def __init__(self, storage_path: str = "./data/monitoring") -> None:
+    def __init__(self, storage_path: str = "./data/monitoring", max_events: int = 1000) -> None:
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
 
         self.metrics: dict[str, AgentMetrics] = {}
-        self.events: list[MonitoringEvent] = []
-        self.max_events = 1000
+        # Health results are reused until metrics change
+        self._mutation_counter = 0
+        self._health_cache: dict[str, tuple[int, AgentHealth]] = {}
+        self.events: deque[MonitoringEvent] = deque(maxlen=max_events)
+
+    @property
+    def max_events(self) -> int:
+        """Number of recent events kept in memory."""
+        return self.events.maxlen
+
+    @max_events.setter
+    def max_events(self, value: int) -> None:
+        # deque bounds are fixed, so rebuild it keeping the newest events
+        self.events = deque(self.events, maxlen=value)
 
     def record_request(
         self,
@@ -128,32 +184,19 @@ class AgentMonitor:
             cost: Cost of the request
             cache_hit: Whether cache was hit
         """
-        import uuid
-
-        if agent_name not in self.metrics:
-            self.metrics[agent_name] = AgentMetrics(agent_name=agent_name)
-
-        metrics = self.metrics[agent_name]
-        metrics.total_requests += 1
-        metrics.total_response_time_ms += response_time_ms
-        metrics.total_tokens += tokens
-        metrics.total_cost += cost
-        metrics.last_request_time = time.time()
-
-        if success:
-            metrics.successful_requests += 1
-        else:
-            metrics.failed_requests += 1
-
-        if cache_hit:
-            metrics.cache_hits += 1
+        metrics = self.metrics.get(agent_name)
+        if metrics is None:
+            metrics = self.metrics[agent_name] = AgentMetrics(agent_name=agent_name)
+        now_ns = time.time_ns()
+        metrics.record(success, response_time_ms, tokens, cost, cache_hit, now_ns / 1e9)
+        self._mutation_counter += 1
 
         # Record event
         event = MonitoringEvent(
-            event_id=str(uuid.uuid4())[:12],
+            event_id=generate_sequential_id(),
             event_type="request",
             agent_name=agent_name,
-            timestamp=datetime.now().isoformat(),
+            timestamp=now_ns,
             data={
                 "success": success,
                 "response_time_ms": response_time_ms,
@@ -161,12 +204,9 @@ class AgentMonitor:
                 "cost": cost,
             },
         )
+        # Oldest events are evicted once max_events is reached
         self.events.append(event)
 
-        # Trim events
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
-
     def get_agent_metrics(self, agent_name: str) -> AgentMetrics | None:
         """Get metrics for a specific agent."""
         return self.metrics.get(agent_name)
@@ -177,6 +217,35 @@ class AgentMonitor:
 
     def check_health(self, agent_name: str) -> AgentHealth:
         """Check health of a specific agent."""
+        return self._check_health(agent_name, None)
+
+    def _check_health(self, agent_name: str, last_check: str | None) -> AgentHealth:
+        """Check health, reusing the last result if metrics are unchanged.
+
+        Args:
+            agent_name: Name of the agent
+            last_check: Check timestamp to use; computed on demand if None
+        """
+        if last_check is None:
+            last_check = datetime.now().isoformat()
+
+        cached = self._health_cache.get(agent_name)
+        if cached and cached[0] == self._mutation_counter:
+            health = cached[1]
+        else:
+            health = self._compute_health(agent_name, last_check)
+            self._health_cache[agent_name] = (self._mutation_counter, health)
+
+        # Callers get their own copy, stamped with this check's time
+        return replace(
+            health,
+            last_check=last_check,
+            issues=list(health.issues),
+            metrics=dict(health.metrics),
+        )
+
+    def _compute_health(self, agent_name: str, last_check: str) -> AgentHealth:
+        """Compute health of an agent from its metrics."""
         metrics = self.metrics.get(agent_name)
 
         if not metrics:
@@ -184,7 +253,7 @@ class AgentMonitor:
                 agent_name=agent_name,
                 status=AgentStatus.UNKNOWN,
                 score=0.0,
-                last_check=datetime.now().isoformat(),
+                last_check=last_check,
                 issues=["No metrics available"],
             )
 
@@ -199,12 +268,7 @@ class AgentMonitor:
             score -= 0.2
 
         # Determine status
-        if score >= 0.8:
-            status = AgentStatus.HEALTHY
-        elif score >= 0.5:
-            status = AgentStatus.DEGRADED
-        else:
-            status = AgentStatus.UNHEALTHY
+        status = _SCORE_STATUSES[bisect_right(_SCORE_THRESHOLDS, score)]
 
         issues = []
         if metrics.error_rate > 0.1:
@@ -218,7 +282,7 @@ class AgentMonitor:
             agent_name=agent_name,
             status=status,
             score=max(0.0, score),
-            last_check=datetime.now().isoformat(),
+            last_check=last_check,
             issues=issues,
             metrics={
                 "success_rate": metrics.success_rate,
@@ -231,19 +295,21 @@ class AgentMonitor:
 
     def get_all_health(self) -> dict[str, AgentHealth]:
         """Get health status for all agents."""
-        return {name: self.check_health(name) for name in self.metrics.keys()}
+        now = datetime.now().isoformat()
+        return {name: self._check_health(name, now) for name in self.metrics}
 
     def get_summary(self) -> dict[str, Any]:
-        """Get monitoring summary."""
-        total_requests = sum(m.total_requests for m in self.metrics.values())
-        total_cost = sum(m.total_cost for m in self.metrics.values())
-        total_tokens = sum(m.total_tokens for m in self.metrics.values())
+        """Get monitoring summary.
 
+        Totals are summed from the per-agent metrics, so requests recorded
+        directly on an AgentMetrics are included too.
+        """
+        metrics = self.metrics.values()
         return {
-            "total_requests": total_requests,
+            "total_requests": sum(m.total_requests for m in metrics),
             "total_agents": len(self.metrics),
-            "total_cost": total_cost,
-            "total_tokens": total_tokens,
+            "total_cost": sum(m.total_cost for m in metrics),
+            "total_tokens": sum(m.total_tokens for m in metrics),
             "agents": {
                 name: {
                     "requests": m.total_requests,
@@ -256,15 +322,16 @@ class AgentMonitor:
 
     def reset_metrics(self, agent_name: str | None = None) -> None:
         """Reset metrics for an agent or all agents."""
+        self._mutation_counter += 1
         if agent_name:
             if agent_name in self.metrics:
                 self.metrics[agent_name] = AgentMetrics(agent_name=agent_name)
         else:
             self.metrics.clear()
 
-    def save_snapshot(self) -> None:
-        """Save monitoring snapshot to file."""
-        snapshot = {
+    def _build_snapshot(self) -> dict[str, Any]:
+        """Collect current metrics into a snapshot dict."""
+        return {
             "timestamp": datetime.now().isoformat(),
             "metrics": {
                 name: {
@@ -280,9 +347,46 @@ class AgentMonitor:
             },
         }
 
+    def _encode_snapshot(self, fast: bool) -> tuple[Path, bytes]:
+        """Build the snapshot file path and its encoded contents."""
+        snapshot = self._build_snapshot()
         snapshot_file = self.storage_path / f"snapshot_{int(time.time())}.json"
-        with open(snapshot_file, "w") as f:
-            json.dump(snapshot, f, indent=2)
+        if not fast:
+            data = json.dumps(snapshot, indent=2).encode()
+        else:
+            data = dumps(snapshot)
+        return snapshot_file, data
+
+    def save_snapshot(self, fast: bool = True) -> None:
+        """Save monitoring snapshot to file.
+
+        Args:
+            fast: Write compact JSON (via orjson when installed); set False
+                for an indented, human-readable file
+        """
+        snapshot_file, data = self._encode_snapshot(fast)
+        snapshot_file.write_bytes(data)
+
+    def append_snapshot(self) -> None:
+        """Append a compact snapshot line to snapshots.jsonl.
+
+        Unlike save_snapshot, this keeps the whole history in a single
+        file instead of one file per snapshot.
+        """
+        with open(self.storage_path / "snapshots.jsonl", "ab") as f:
+            f.write(dumps(self._build_snapshot()) + b"\n")
+
+    async def save_snapshot_async(self, fast: bool = True) -> None:
+        """Save monitoring snapshot without blocking the event loop.
+
+        Metrics are captured on the calling thread so the snapshot is
+        consistent; only the file write runs in a worker thread.
+
+        Args:
+            fast: Same as save_snapshot
+        """
+        snapshot_file, data = self._encode_snapshot(fast)
+        await asyncio.to_thread(snapshot_file.write_bytes, data)
 
 
 # Global instance
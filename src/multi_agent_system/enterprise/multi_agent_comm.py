@@ -6,12 +6,16 @@ Provides structured message passing, protocols, and coordination mechanisms.
 
 from __future__ import annotations
 
-import uuid
-from dataclasses import dataclass, field
+import asyncio
+from collections import OrderedDict, deque
+from dataclasses import field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Callable
 
+from ..decorators import slotted_dataclass
+from ..id_generator import generate_sequential_id
+
 
 class MessageType(Enum):
     """Message types in multi-agent communication."""
@@ -42,7 +46,7 @@ class MessageStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@slotted_dataclass
 class AgentAddress:
     """Agent address for routing."""
     agent_id: str = ""
@@ -59,10 +63,10 @@ class AgentAddress:
         return True
 
 
-@dataclass
+@slotted_dataclass
 class Message:
     """Agent message."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=generate_sequential_id)
     msg_type: MessageType = MessageType.REQUEST
     priority: MessagePriority = MessagePriority.NORMAL
     status: MessageStatus = MessageStatus.PENDING
@@ -99,15 +103,16 @@ class Message:
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
+        sender = self.sender
         return {
             "id": self.id,
             "type": self.msg_type.value,
             "priority": self.priority.value,
             "status": self.status.value,
             "sender": {
-                "agent_id": self.sender.agent_id,
-                "agent_type": self.sender.agent_type,
-                "capability": self.sender.capability,
+                "agent_id": sender.agent_id,
+                "agent_type": sender.agent_type,
+                "capability": sender.capability,
             },
             "content": self.content,
             "payload": self.payload,
@@ -122,18 +127,35 @@ class MessageRouter:
     def __init__(self) -> None:
         """Initialize message router."""
         self._agents: dict[str, AgentAddress] = {}
-        self._handlers: dict[MessageType, list[Callable]] = {
-            mt: [] for mt in MessageType
+        self._by_type: dict[str, dict[str, None]] = {}  # agent type -> agent ids
+        self._by_capability: dict[str, dict[str, None]] = {}  # capability -> agent ids
+        # Handler tuples are replaced, never mutated, so dispatch can
+        # iterate them while handlers are being registered
+        self._handlers: dict[MessageType, tuple[Callable, ...]] = {
+            mt: () for mt in MessageType
         }
 
     def register_agent(self, address: AgentAddress) -> None:
         """Register an agent."""
+        self.unregister_agent(address.agent_id)
         self._agents[address.agent_id] = address
+        # Dicts used as insertion-ordered sets of agent ids
+        self._by_type.setdefault(address.agent_type, {})[address.agent_id] = None
+        self._by_capability.setdefault(address.capability, {})[address.agent_id] = None
 
     def unregister_agent(self, agent_id: str) -> None:
         """Unregister an agent."""
-        if agent_id in self._agents:
-            del self._agents[agent_id]
+        address = self._agents.pop(agent_id, None)
+        if address is None:
+            return
+        for index, key in (
+            (self._by_type, address.agent_type),
+            (self._by_capability, address.capability),
+        ):
+            ids = index[key]
+            del ids[agent_id]
+            if not ids:
+                del index[key]
 
     def find_agents(
         self,
@@ -141,36 +163,59 @@ class MessageRouter:
         capability: str | None = None,
     ) -> list[AgentAddress]:
         """Find agents matching criteria."""
-        results = []
-        for address in self._agents.values():
-            if address.matches(agent_type, capability):
-                results.append(address)
-        return results
+        if not agent_type and not capability:
+            return list(self._agents.values())
+
+        by_type = self._by_type.get(agent_type, {}) if agent_type else None
+        by_capability = self._by_capability.get(capability, {}) if capability else None
+
+        if by_type is None:
+            ids = by_capability
+        elif by_capability is None:
+            ids = by_type
+        else:
+            small, large = sorted((by_type, by_capability), key=len)
+            ids = [agent_id for agent_id in small if agent_id in large]
+        return [self._agents[agent_id] for agent_id in ids]
 
     def register_handler(self, msg_type: MessageType, handler: Callable) -> None:
         """Register message handler."""
-        self._handlers[msg_type].append(handler)
+        self._handlers[msg_type] = self._handlers.get(msg_type, ()) + (handler,)
 
     async def dispatch(self, message: Message) -> dict[str, Any]:
-        """Dispatch message to appropriate handlers."""
-        handlers = self._handlers.get(message.msg_type, [])
+        """Dispatch message to appropriate handlers.
+
+        Handlers run concurrently, so they must not depend on each other's
+        side effects. Results keep registration order.
+        """
+        handlers = self._handlers.get(message.msg_type, ())
 
-        results = []
-        for handler in handlers:
+        async def _run(handler: Callable) -> dict[str, Any]:
+            # Errors from calling the handler or awaiting its result are
+            # reported per handler rather than failing the whole dispatch
             try:
-                result = await handler(message)
-                results.append({"handler": handler.__name__, "result": result})
+                return {"handler": handler.__name__, "result": await handler(message)}
             except Exception as e:
-                results.append({"handler": handler.__name__, "error": str(e)})
+                return {"handler": handler.__name__, "error": str(e)}
+
+        outcomes = await asyncio.gather(
+            *(_run(handler) for handler in handlers),
+            return_exceptions=True,
+        )
 
-        return {"dispatched": len(results), "results": results}
+        # Cancellation and other BaseExceptions still propagate
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
 
+        return {"dispatched": len(outcomes), "results": outcomes}
 
-@dataclass
+
+@slotted_dataclass
 class Conversation:
     """Conversation thread between agents."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    participants: list[str] = field(default_factory=list)  # Agent IDs
+    id: str = field(default_factory=generate_sequential_id)
+    participants: set[str] = field(default_factory=set)  # Agent IDs
     messages: list[Message] = field(default_factory=list)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
@@ -212,7 +257,14 @@ class AgentCommunication:
         """Initialize communication system."""
         self.router = MessageRouter()
         self._conversations: dict[str, Conversation] = {}
-        self._pending_messages: dict[str, Message] = {}
+        # Most recent messages in send order; oldest are evicted past max_pending,
+        # together with their entries in the tallies and _by_agent
+        self._pending_messages: OrderedDict[str, Message] = OrderedDict()
+        self.max_pending = 10_000
+        # Tallies over pending messages, kept in step with send/evict
+        self._by_type: dict[MessageType, int] = {}
+        self._by_priority: dict[MessagePriority, int] = {}
+        self._by_agent: dict[str, deque[Message]] = {}  # sender id -> pending sent messages
         self._delivery_callbacks: list[Callable] = []
 
     def register_agent(self, agent_id: str, agent_type: str = "", capability: str = "") -> None:
@@ -260,7 +312,7 @@ class AgentCommunication:
             sender=sender_addr,
             content=content,
             payload=payload or {},
-            conversation_id=conversation_id or str(uuid.uuid4()),
+            conversation_id=conversation_id or generate_sequential_id(),
         )
 
         # Set recipient if specified
@@ -277,26 +329,55 @@ class AgentCommunication:
 
         # Store in pending
         self._pending_messages[message.id] = message
+        self._count_pending(message, 1)
+        if len(self._pending_messages) > self.max_pending:
+            _, evicted = self._pending_messages.popitem(last=False)
+            self._count_pending(evicted, -1)
+            self._forget_sent(evicted)
 
         # Update conversation
         conv_id = message.conversation_id
-        if conv_id not in self._conversations:
-            self._conversations[conv_id] = Conversation(id=conv_id)
-            self._conversations[conv_id].participants = [sender_id]
-            if recipient_id:
-                self._conversations[conv_id].participants.append(recipient_id)
-
-        self._conversations[conv_id].add_message(message)
-        self._conversations[conv_id].participants.extend([
-            sender_id,
-            recipient_id
-        ]) if recipient_id else []
+        conv = self._conversations.get(conv_id)
+        if conv is None:
+            conv = self._conversations[conv_id] = Conversation(id=conv_id)
+
+        conv.add_message(message)
+        conv.participants.add(sender_id)
+        if recipient_id:
+            conv.participants.add(recipient_id)
+        self._by_agent.setdefault(sender_id, deque()).append(message)
 
         # Update status
         message.status = MessageStatus.SENT
 
         return message
 
+    def _count_pending(self, message: Message, delta: int) -> None:
+        """Adjust the by-type and by-priority tallies for a message."""
+        t = message.msg_type
+        count = self._by_type.get(t, 0) + delta
+        if count:
+            self._by_type[t] = count
+        else:
+            del self._by_type[t]
+
+        p = message.priority
+        count = self._by_priority.get(p, 0) + delta
+        if count:
+            self._by_priority[p] = count
+        else:
+            del self._by_priority[p]
+
+    def _forget_sent(self, message: Message) -> None:
+        """Drop an evicted message from its sender's message list."""
+        sender_id = message.sender.agent_id
+        sent = self._by_agent.get(sender_id)
+        # Eviction is oldest-first, so the message heads its sender's list
+        if sent and sent[0] is message:
+            sent.popleft()
+            if not sent:
+                del self._by_agent[sender_id]
+
     def reply_to(
         self,
         original_message: Message,
@@ -361,41 +442,26 @@ class AgentCommunication:
         return self._conversations.get(conversation_id)
 
     def get_agent_messages(self, agent_id: str) -> list[Message]:
-        """Get all messages for an agent."""
-        messages = []
-        for conv in self._conversations.values():
-            messages.extend(conv.get_messages(agent_id))
-        return sorted(messages, key=lambda m: m.created_at)
+        """Get the pending messages sent by an agent."""
+        # send_message only appends, so each list is already in creation order
+        return list(self._by_agent.get(agent_id, ()))
 
     def get_statistics(self) -> dict[str, Any]:
         """Get communication statistics."""
-        total_messages = len(self._pending_messages)
-        by_type = {}
-        by_priority = {}
-
-        for msg in self._pending_messages.values():
-            t = msg.msg_type.value
-            by_type[t] = by_type.get(t, 0) + 1
-
-            p = msg.priority.value
-            by_priority[p] = by_priority.get(p, 0) + 1
-
         return {
-            "total_messages": total_messages,
+            "total_messages": len(self._pending_messages),
             "active_conversations": len(self._conversations),
             "registered_agents": len(self.router._agents),
-            "by_type": by_type,
-            "by_priority": by_priority,
+            "by_type": {t.value: n for t, n in self._by_type.items()},
+            "by_priority": {p.value: n for p, n in self._by_priority.items()},
         }
 
 
-# Global communication system
-_communication: AgentCommunication | None = None
+# Global communication system; cheap to build and touches no storage,
+# so it is created at import rather than on first use
+_communication = AgentCommunication()
 
 
 def get_communication() -> AgentCommunication:
     """Get global communication system."""
-    global _communication
-    if _communication is None:
-        _communication = AgentCommunication()
     return _communication
@@ -6,11 +6,23 @@ Provides negotiation, bargaining, and agreement mechanisms for multi-agent syste
 from __future__ import annotations
 
 import uuid
-from dataclasses import dataclass, field
+from collections import deque
+from dataclasses import field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
+from ..decorators import slotted_dataclass
+from ..id_generator import generate_hex_id
+
+
+# Offers within this relative change of the same agent's previous offer
+# count as stalled
+CONVERGENCE_EPSILON = 0.02
+# Consecutive stalled offers before a negotiation is declared an impasse
+CONVERGENCE_PATIENCE = 2
+
 
 class NegotiationState(Enum):
     """Negotiation state."""
@@ -31,10 +43,10 @@ class OfferType(Enum):
     WITHDRAW = "withdraw"
 
 
-@dataclass
+@slotted_dataclass
 class Offer:
     """A negotiation offer."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=generate_hex_id)
     offer_type: OfferType = OfferType.PROPOSAL
 
     # Content
@@ -51,16 +63,18 @@ class Offer:
     expires_at: datetime | None = None
 
 
-@dataclass
+@slotted_dataclass
 class NegotiationRound:
     """A round in negotiation."""
     round_number: int = 0
-    offers: list[Offer] = field(default_factory=list)
+    # Most recent offers only; sized per party count by NegotiationManager
+    offers: deque[Offer] = field(default_factory=lambda: deque(maxlen=8))
+    last_offer: Offer | None = None  # Latest entry of offers, set by submit_offer
     state: NegotiationState = NegotiationState.PROPOSING
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@slotted_dataclass
 class Negotiation:
     """A negotiation session."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -81,6 +95,9 @@ class Negotiation:
     # Result
     agreement: dict[str, Any] | None = None
     outcome: str = ""  # "agreement", "impasse", "withdrawal"
+    stalled_offers: int = 0  # Consecutive valued offers that barely moved in value
+    # Agent ID -> that agent's latest offer with a value, for convergence checks
+    last_valued_offers: dict[str, Offer] = field(default_factory=dict)
 
     created_at: datetime = field(default_factory=datetime.now)
     completed_at: datetime | None = None
@@ -106,6 +123,12 @@ class NegotiationStrategy:
         raise NotImplementedError
 
 
+@lru_cache(maxsize=32)
+def _bargain_value(round_num: int) -> float:
+    """Offer value for a round: start at 100, drop 10 per round, floor at 50."""
+    return max(100.0 - 10.0 * round_num, 50.0)
+
+
 class BargainingStrategy(NegotiationStrategy):
     """Bargaining negotiation strategy."""
 
@@ -116,11 +139,7 @@ class BargainingStrategy(NegotiationStrategy):
     ) -> Offer | None:
         """Make a bargaining offer."""
         round_num = len(negotiation.rounds)
-
-        # Calculate offer value based on round
-        base_value = 100.0
-        decrement = 10.0 * round_num
-        value = max(base_value - decrement, 50.0)
+        value = _bargain_value(round_num)
 
         return Offer(
             offer_type=OfferType.PROPOSAL,
@@ -156,6 +175,7 @@ class NegotiationManager:
         """Initialize negotiation manager."""
         self._negotiations: dict[str, Negotiation] = {}
         self._strategies: dict[str, NegotiationStrategy] = {}
+        self._outcome_counts: dict[str, int] = {}  # outcome -> negotiations
         self._load_defaults()
 
     def _load_defaults(self) -> None:
@@ -190,6 +210,7 @@ class NegotiationManager:
         round_num = len(negotiation.rounds) + 1
         negotiation_round = NegotiationRound(
             round_number=round_num,
+            offers=deque(maxlen=max(len(negotiation.parties) * 2, 4)),
             state=NegotiationState.PROPOSING,
         )
         negotiation.rounds.append(negotiation_round)
@@ -209,15 +230,35 @@ class NegotiationManager:
         if not negotiation:
             return False
 
-        if not negotiation.rounds:
+        if not negotiation.rounds or negotiation.state is NegotiationState.FAILED:
             return False
 
         offer.agent_id = agent_id
         offer.agent_name = agent_name
 
-        negotiation.rounds[-1].offers.append(offer)
+        current_round = negotiation.rounds[-1]
+        current_round.offers.append(offer)
+        current_round.last_offer = offer
         negotiation.state = NegotiationState.COUNTERING
 
+        # Stop early once agents stop moving instead of running out rounds.
+        # Only offers with a value count (terms-only offers leave it at 0.0),
+        # and each is compared with the same agent's previous one so that
+        # parties converging on a shared value are not treated as stuck.
+        if offer.value:
+            previous = negotiation.last_valued_offers.get(agent_id)
+            negotiation.last_valued_offers[agent_id] = offer
+            if previous is not None:
+                delta = abs(offer.value - previous.value) / abs(previous.value)
+                if delta < CONVERGENCE_EPSILON:
+                    negotiation.stalled_offers += 1
+                else:
+                    negotiation.stalled_offers = 0
+                if negotiation.stalled_offers >= CONVERGENCE_PATIENCE and not negotiation.outcome:
+                    negotiation.state = NegotiationState.FAILED
+                    self._set_outcome(negotiation, "impasse")
+                    negotiation.completed_at = datetime.now()
+
         return True
 
     def respond_to_offer(
@@ -231,13 +272,12 @@ class NegotiationManager:
         negotiation = self._negotiations.get(negotiation_id)
         if not negotiation or not negotiation.rounds:
             return False
-
-        current_round = negotiation.rounds[-1]
-        if not current_round.offers:
+        if negotiation.state is NegotiationState.FAILED:
             return False
 
-        # Get last offer
-        last_offer = current_round.offers[-1]
+        last_offer = negotiation.rounds[-1].last_offer
+        if last_offer is None:
+            return False
 
         if accept:
             # Accept
@@ -245,7 +285,7 @@ class NegotiationManager:
             negotiation.state = NegotiationState.ACCEPTING
             negotiation.agreement = last_offer.terms
             negotiation.final_offer = last_offer
-            negotiation.outcome = "agreement"
+            self._set_outcome(negotiation, "agreement")
             negotiation.completed_at = datetime.now()
         else:
             # Reject
@@ -255,7 +295,7 @@ class NegotiationManager:
             # Check if max rounds reached
             if len(negotiation.rounds) >= 10:
                 negotiation.state = NegotiationState.FAILED
-                negotiation.outcome = "impasse"
+                self._set_outcome(negotiation, "impasse")
                 negotiation.completed_at = datetime.now()
             else:
                 # Add new round
@@ -263,6 +303,16 @@ class NegotiationManager:
 
         return True
 
+    def _set_outcome(self, negotiation: Negotiation, outcome: str) -> None:
+        """Set negotiation outcome, keeping outcome counts in sync."""
+        previous = negotiation.outcome
+        if previous == outcome:
+            return
+        if previous:
+            self._outcome_counts[previous] -= 1
+        self._outcome_counts[outcome] = self._outcome_counts.get(outcome, 0) + 1
+        negotiation.outcome = outcome
+
     def get_negotiation(self, negotiation_id: str) -> Negotiation | None:
         """Get negotiation by ID."""
         return self._negotiations.get(negotiation_id)
@@ -270,8 +320,8 @@ class NegotiationManager:
     def get_statistics(self) -> dict[str, Any]:
         """Get negotiation statistics."""
         total = len(self._negotiations)
-        agreements = sum(1 for n in self._negotiations.values() if n.outcome == "agreement")
-        impasses = sum(1 for n in self._negotiations.values() if n.outcome == "impasse")
+        agreements = self._outcome_counts.get("agreement", 0)
+        impasses = self._outcome_counts.get("impasse", 0)
 
         return {
             "total_negotiations": total,
@@ -281,13 +331,8 @@ class NegotiationManager:
         }
 
 
-# Global manager
-_negotiation_manager: NegotiationManager | None = None
-
-
+# Global manager, created on first use
+@lru_cache(maxsize=1)
 def get_negotiation_manager() -> NegotiationManager:
     """Get global negotiation manager."""
-    global _negotiation_manager
-    if _negotiation_manager is None:
-        _negotiation_manager = NegotiationManager()
-    return _negotiation_manager
+    return NegotiationManager()
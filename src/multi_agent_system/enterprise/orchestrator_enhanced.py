@@ -5,6 +5,9 @@ Extends the base orchestrator with planning, consensus, and evaluation.
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import time
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
@@ -15,12 +18,23 @@ from ..core.message import Message
 from .planner import TaskPlanner, get_planner
 from .memory import MemorySystem, get_memory_system
 from .evaluator import EvaluationSystem, get_evaluation_system
-from .consensus import ConsensusManager, get_consensus_manager
+from .consensus import AgentOpinion, ConsensusManager, get_consensus_manager
 from .rag import KnowledgeAugmentation, get_knowledge_augmentation
 from .proactive import ProactiveLayer, get_proactive_layer
 from .continual import ContinualLearning, get_continual_learning
 
 
+# Map plan step agent_type to the registered agent name
+_AGENT_NAMES_BY_TYPE = {
+    "arxiv": "arxiv-agent",
+    "intent_classification": "intent-classification-agent",
+    "entity_extraction": "entity-extraction-agent",
+    "semantic_search": "semantic-search-agent",
+    "matching": "matching-agent",
+    "paper_search": "paper-search-agent",
+}
+
+
 class ExecutionStrategy(Enum):
     """Multi-agent execution strategies."""
 
@@ -63,6 +77,13 @@ class EnhancedOrchestrator:
     ) -> None:
         self.agents = {agent.name: agent for agent in agents}
         self.config = config or ExecutionConfig()
+        self._capability_index: dict[str, BaseAgent] = {}
+        self._build_capability_index()
+        # Shared by parallel and consensus execution; threads start lazily
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.config.max_agents * 2,
+            thread_name_prefix="orch",
+        )
 
         # Enterprise components
         self.planner = get_planner()
@@ -75,20 +96,10 @@ class EnhancedOrchestrator:
 
     def dispatch(self, message: Message, user_id: str | None = None) -> AgentResponse:
         """Dispatch task with enhanced processing."""
-        import time
-
         start_time = time.time()
 
         try:
-            # 1. Update context
-            if user_id and self.config.enable_memory:
-                self.proactive.update_context(user_id, message.content.get("query", ""))
-
-            # 2. Generate execution plan
-            plan = self.planner.plan(
-                message.content.get("query", ""),
-                {"task_type": message.task_type, "user_id": user_id},
-            )
+            plan = self._prepare(message, user_id)
 
             # 3. Execute based on strategy
             if self.config.strategy == ExecutionStrategy.SINGLE:
@@ -100,43 +111,98 @@ class EnhancedOrchestrator:
             else:
                 response = self._execute_single(message)
 
-            # 4. Evaluate if enabled
-            if self.config.enable_evaluation and message.content.get("query"):
-                eval_result = self.evaluator.evaluate(
-                    query=message.content.get("query", ""),
-                    response=str(response.data),
-                    context={"task_type": message.task_type},
-                )
-                response.data = response.data or {}
-                response.data["_evaluation"] = eval_result.to_dict()
-
-            # 5. Update memory
-            if self.config.enable_memory and message.content.get("query"):
-                self.memory.remember(
-                    content=f"Query: {message.content.get('query')} -> Response: {response.data}",
-                    memory_type="short_term",
-                )
+            return self._finish(message, response, user_id, start_time)
+
+        except Exception as e:
+            return self._error_response(message, e)
+
+    async def adispatch(self, message: Message, user_id: str | None = None) -> AgentResponse:
+        """Asynchronous dispatch with enhanced processing.
+
+        Preferred in async contexts: parallel steps are awaited together
+        on the event loop instead of in a thread pool. Planning and the
+        evaluation/memory bookkeeping run in worker threads so they do not
+        block the loop either.
+        """
+        start_time = time.time()
 
-            # 6. Add proactive suggestions
-            if user_id:
-                suggestion = self.proactive.get_proactive_suggestion(user_id)
-                if suggestion:
-                    response.data = response.data or {}
-                    response.data["_suggestion"] = suggestion
+        try:
+            plan = await asyncio.to_thread(self._prepare, message, user_id)
 
-            # 7. Track execution time
-            response.data = response.data or {}
-            response.data["_execution_time_ms"] = (time.time() - start_time) * 1000
+            if self.config.strategy == ExecutionStrategy.PARALLEL:
+                response = await self._execute_parallel_async(message, plan)
+            elif self.config.strategy == ExecutionStrategy.CONSENSUS:
+                response = await asyncio.to_thread(self._execute_consensus, message, plan)
+            else:
+                agent = self._find_agent(message)
+                if agent:
+                    response = await self._ahandle(agent, message)
+                else:
+                    response = self._execute_single(message)
 
-            return response
+            return await asyncio.to_thread(self._finish, message, response, user_id, start_time)
 
         except Exception as e:
-            return AgentResponse(
-                agent="enhanced-orchestrator",
-                success=False,
-                error=str(e),
-                trace_id=message.trace_id,
+            return self._error_response(message, e)
+
+    def _prepare(self, message: Message, user_id: str | None) -> Any:
+        """Update user context and generate the execution plan."""
+        # 1. Update context
+        if user_id and self.config.enable_memory:
+            self.proactive.update_context(user_id, message.content.get("query", ""))
+
+        # 2. Generate execution plan
+        return self.planner.plan(
+            message.content.get("query", ""),
+            {"task_type": message.task_type, "user_id": user_id},
+        )
+
+    def _finish(
+        self,
+        message: Message,
+        response: AgentResponse,
+        user_id: str | None,
+        start_time: float,
+    ) -> AgentResponse:
+        """Evaluate, remember and annotate a response."""
+        # 4. Evaluate if enabled
+        eval_result = None
+        if self.config.enable_evaluation and message.content.get("query"):
+            eval_result = self.evaluator.evaluate(
+                query=message.content.get("query", ""),
+                response=str(response.data),
+                context={"task_type": message.task_type},
             )
+        response.data = response.data or {}
+        if eval_result is not None:
+            response.data["_evaluation"] = eval_result.to_dict()
+
+        # 5. Update memory
+        if self.config.enable_memory and message.content.get("query"):
+            self.memory.remember(
+                content=f"Query: {message.content.get('query')} -> Response: {response.data}",
+                memory_type="short_term",
+            )
+
+        # 6. Add proactive suggestions
+        if user_id:
+            suggestion = self.proactive.get_proactive_suggestion(user_id)
+            if suggestion:
+                response.data["_suggestion"] = suggestion
+
+        # 7. Track execution time
+        response.data["_execution_time_ms"] = (time.time() - start_time) * 1000
+
+        return response
+
+    def _error_response(self, message: Message, error: Exception) -> AgentResponse:
+        """Build the response returned when dispatch fails."""
+        return AgentResponse(
+            agent="enhanced-orchestrator",
+            success=False,
+            error=str(error),
+            trace_id=message.trace_id,
+        )
 
     def _execute_single(self, message: Message) -> AgentResponse:
         """Execute with single agent."""
@@ -154,45 +220,85 @@ class EnhancedOrchestrator:
 
     def _execute_parallel(self, message: Message, plan: Any) -> AgentResponse:
         """Execute with multiple agents in parallel."""
-        import concurrent.futures
-        import uuid
+        step_tasks = self._step_tasks(message, plan)
 
-        # Get agents for each step
-        agent_tasks = []
+        futures = {
+            self._pool.submit(agent.handle, msg): step
+            for step, agent, msg in step_tasks
+        }
+
+        results = []
+        for future in concurrent.futures.as_completed(futures):
+            step = futures[future]
+            try:
+                result = future.result()
+                results.append((step.step_id, result))
+            except Exception:
+                results.append((step.step_id, None))
+
+        return self._combine_step_results(message, results)
+
+    async def _execute_parallel_async(self, message: Message, plan: Any) -> AgentResponse:
+        """Execute with multiple agents concurrently on the event loop."""
+        step_tasks = self._step_tasks(message, plan)
+        outcomes = await asyncio.gather(
+            *(self._ahandle(agent, msg) for _, agent, msg in step_tasks),
+            return_exceptions=True,
+        )
+
+        results = []
+        for (step, _, _), outcome in zip(step_tasks, outcomes):
+            if isinstance(outcome, Exception):
+                results.append((step.step_id, None))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results.append((step.step_id, outcome))
+
+        return self._combine_step_results(message, results)
+
+    async def _ahandle(self, agent: BaseAgent, message: Message) -> AgentResponse:
+        """Run an agent without blocking the event loop."""
+        if agent.is_async():
+            return await agent.ahandle(message)
+        return await asyncio.to_thread(agent.handle, message)
+
+    def _step_tasks(
+        self,
+        message: Message,
+        plan: Any,
+    ) -> list[tuple[Any, BaseAgent, Message]]:
+        """Pair each plan step with its agent and step message."""
+        step_tasks = []
         for step in plan.steps:
             agent = self._find_agent_by_type(step.agent_type)
             if agent:
-                agent_tasks.append((step, agent))
-
-        results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=len(agent_tasks)) as executor:
-            futures = {}
-            for step, agent in agent_tasks:
                 msg = Message(
                     task_type=message.task_type,
                     content={**message.content, "step_id": step.step_id},
                     trace_id=message.trace_id,
                 )
-                future = executor.submit(agent.handle, msg)
-                futures[future] = step
-
-            for future in concurrent.futures.as_completed(futures):
-                step = futures[future]
-                try:
-                    result = future.result()
-                    results.append((step.step_id, result))
-                except Exception as e:
-                    results.append((step.step_id, None))
-
-        # Aggregate results
-        combined_data = {"steps": [], "final_result": None}
-        for step_id, result in results:
-            if result:
-                combined_data["steps"].append(
-                    {"step_id": step_id, "success": result.success, "data": result.data}
-                )
-                if result.success:
-                    combined_data["final_result"] = result.data
+                step_tasks.append((step, agent, msg))
+        return step_tasks
+
+    def _combine_step_results(
+        self,
+        message: Message,
+        results: list[tuple[str, AgentResponse | None]],
+    ) -> AgentResponse:
+        """Aggregate per-step results into one response."""
+        combined_data = {
+            "steps": [
+                {"step_id": step_id, "success": result.success, "data": result.data}
+                for step_id, result in results
+                if result
+            ],
+            # Last successful step in result order
+            "final_result": next(
+                (result.data for _, result in reversed(results) if result and result.success),
+                None,
+            ),
+        }
 
         return AgentResponse(
             agent="enhanced-orchestrator",
@@ -203,23 +309,46 @@ class EnhancedOrchestrator:
 
     def _execute_consensus(self, message: Message, plan: Any) -> AgentResponse:
         """Execute with consensus among multiple agents."""
-        from .consensus import AgentOpinion
-
         # Get multiple agent opinions
-        opinions = []
+        agents = []
         for step in plan.steps[:3]:  # Limit to 3 agents
             agent = self._find_agent_by_type(step.agent_type)
             if agent:
-                result = agent.handle(message)
-                if result.success:
-                    opinion = AgentOpinion(
-                        agent_id=agent.name,
-                        agent_type=agent.name,
-                        decision=str(result.data),
-                        confidence=0.8,  # Default confidence
-                        reasoning="Agent output",
-                    )
-                    opinions.append(opinion)
+                agents.append(agent)
+
+        # Agents are queried concurrently; opinions keep step order
+        futures = [(agent, self._pool.submit(agent.handle, message)) for agent in agents]
+        # One deadline for all agents, not timeout_seconds per agent
+        _, not_done = concurrent.futures.wait(
+            [future for _, future in futures],
+            timeout=self.config.timeout_seconds,
+        )
+        for future in not_done:
+            # Drops calls still queued; calls already running finish unobserved
+            future.cancel()
+
+        opinions = []
+        failed_agents = []  # Agents left out of the decision, with the reason
+        for agent, future in futures:
+            if future in not_done:
+                failed_agents.append({"agent": agent.name, "error": "timed out"})
+                continue
+            error = future.exception()
+            if error is not None:
+                failed_agents.append({"agent": agent.name, "error": str(error) or type(error).__name__})
+                continue
+            result = future.result()
+            if not result.success:
+                failed_agents.append({"agent": agent.name, "error": result.error or "unsuccessful"})
+                continue
+            opinion = AgentOpinion(
+                agent_id=agent.name,
+                agent_type=agent.name,
+                decision=str(result.data),
+                confidence=0.8,  # Default confidence
+                reasoning="Agent output",
+            )
+            opinions.append(opinion)
 
         if not opinions:
             return self._execute_single(message)
@@ -236,36 +365,36 @@ class EnhancedOrchestrator:
                 "agreed_by": decision_result.agreed_by,
                 "disagreed_by": decision_result.disagreed_by,
                 "all_opinions": [{"agent": o.agent_id, "decision": o.decision} for o in opinions],
+                "failed_agents": failed_agents,
             },
             trace_id=message.trace_id,
         )
 
+    def _build_capability_index(self) -> None:
+        """Map each capability to the first registered agent offering it."""
+        self._capability_index = {}
+        for agent in self.agents.values():
+            for capability in getattr(agent, "capabilities", ()):
+                self._capability_index.setdefault(capability, agent)
+
     def _find_agent(self, message: Message) -> BaseAgent | None:
         """Find first suitable agent."""
-        for agent in self.agents.values():
-            if hasattr(agent, "capabilities") and message.task_type in agent.capabilities:
-                return agent
+        agent = self._capability_index.get(message.task_type)
+        if agent:
+            return agent
         # Fallback to any agent
-        return list(self.agents.values())[0] if self.agents else None
+        return next(iter(self.agents.values()), None)
 
     def _find_agent_by_type(self, agent_type: str) -> BaseAgent | None:
         """Find agent by type/capability."""
-        # Map agent_type to actual agent
-        type_map = {
-            "arxiv": "arxiv-agent",
-            "intent_classification": "intent-classification-agent",
-            "entity_extraction": "entity-extraction-agent",
-            "semantic_search": "semantic-search-agent",
-            "matching": "matching-agent",
-            "paper_search": "paper-search-agent",
-        }
-
-        agent_name = type_map.get(agent_type, agent_type)
+        agent_name = _AGENT_NAMES_BY_TYPE.get(agent_type, agent_type)
         return self.agents.get(agent_name)
 
     def register_agent(self, agent: BaseAgent) -> None:
         """Register a new agent."""
         self.agents[agent.name] = agent
+        # Rebuilt rather than patched so a replaced agent drops out
+        self._build_capability_index()
 
     def set_strategy(self, strategy: ExecutionStrategy) -> None:
         """Set execution strategy."""
@@ -274,3 +403,17 @@ class EnhancedOrchestrator:
     def enable_rag(self, enabled: bool = True) -> None:
         """Enable/disable RAG augmentation."""
         self.config.enable_rag = enabled
+
+    def close(self) -> None:
+        """Shut down the shared worker pool.
+
+        The orchestrator owns the pool, so call this (or use the
+        orchestrator as a context manager) once it is no longer needed.
+        """
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "EnhancedOrchestrator":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
@@ -7,11 +7,14 @@ and character modeling for multi-agent systems.
 from __future__ import annotations
 
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
+from ..decorators import slotted_dataclass
+
 
 class PersonaType(Enum):
     """Types of personas."""
@@ -31,7 +34,7 @@ class CommunicationStyle(Enum):
     DIRECT = "direct"
 
 
-@dataclass
+@slotted_dataclass
 class PersonaAttribute:
     """A single persona attribute."""
     name: str = ""
@@ -39,7 +42,7 @@ class PersonaAttribute:
     weight: float = 1.0  # Importance 0-1
 
 
-@dataclass
+@slotted_dataclass
 class Persona:
     """Agent persona with characteristics."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -84,38 +87,60 @@ class Persona:
         }
 
     def to_system_prompt(self) -> str:
-        """Generate system prompt from persona."""
-        parts = [f"You are {self.name}."]
-
-        if self.description:
-            parts.append(self.description)
-
-        if self.background:
-            parts.append(f"Background: {self.background}")
-
-        if self.expertise:
-            parts.append(f"Your expertise includes: {', '.join(self.expertise)}.")
+        """Generate system prompt from persona.
+
+        Rendering is cached on the prompt-relevant fields, so in-place
+        edits (including to the lists) are always reflected.
+        """
+        return _render_system_prompt(
+            self.name,
+            self.description,
+            self.background,
+            tuple(self.expertise),
+            self.communication_style,
+            self.tone,
+            tuple(self.guidelines),
+            tuple(self.limitations),
+        )
 
-        if self.communication_style != CommunicationStyle.CASUAL:
-            parts.append(f"Communication style: {self.communication_style.value}.")
 
-        if self.tone != "neutral":
-            parts.append(f"Tone: {self.tone}.")
+@lru_cache(maxsize=256)
+def _render_system_prompt(
+    name: str,
+    description: str,
+    background: str,
+    expertise: tuple[str, ...],
+    communication_style: CommunicationStyle,
+    tone: str,
+    guidelines: tuple[str, ...],
+    limitations: tuple[str, ...],
+) -> str:
+    """Render a persona system prompt from its prompt-relevant fields."""
+    parts = [
+        part for part in (
+            f"You are {name}.",
+            description,
+            background and f"Background: {background}",
+            expertise and f"Your expertise includes: {', '.join(expertise)}.",
+            communication_style is not CommunicationStyle.CASUAL
+            and f"Communication style: {communication_style.value}.",
+            tone != "neutral" and f"Tone: {tone}.",
+        )
+        if part
+    ]
 
-        if self.guidelines:
-            parts.append("\\nGuidelines:")
-            for g in self.guidelines:
-                parts.append(f"- {g}")
+    if guidelines:
+        parts.append("\\nGuidelines:")
+        parts.extend(f"- {g}" for g in guidelines)
 
-        if self.limitations:
-            parts.append("\\nLimitations:")
-            for l in self.limitations:
-                parts.append(f"- {l}")
+    if limitations:
+        parts.append("\\nLimitations:")
+        parts.extend(f"- {l}" for l in limitations)
 
-        return "\n".join(parts)
+    return "\n".join(parts)
 
 
-@dataclass
+@slotted_dataclass
 class AgentRole:
     """Agent role definition."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -157,6 +182,9 @@ class RoleRegistry:
         """Initialize role registry."""
         self._roles: dict[str, AgentRole] = {}
         self._personas: dict[str, Persona] = {}
+        # Lowercased name -> entry; the latest registration wins on clashes
+        self._roles_by_name: dict[str, AgentRole] = {}
+        self._personas_by_name: dict[str, Persona] = {}
         self._load_defaults()
 
     def _load_defaults(self) -> None:
@@ -188,6 +216,7 @@ class RoleRegistry:
 
         for p in personas:
             self._personas[p.id] = p
+            self._personas_by_name[p.name.lower()] = p
 
         # Default roles
         roles = [
@@ -213,16 +242,19 @@ class RoleRegistry:
 
         for r in roles:
             self._roles[r.id] = r
+            self._roles_by_name[r.name.lower()] = r
 
     def register_role(self, role: AgentRole) -> AgentRole:
         """Register a role."""
         self._roles[role.id] = role
+        self._roles_by_name[role.name.lower()] = role
         return role
 
     def register_persona(self, persona: Persona) -> Persona:
         """Register a persona."""
         persona.updated_at = datetime.now()
         self._personas[persona.id] = persona
+        self._personas_by_name[persona.name.lower()] = persona
         return persona
 
     def get_role(self, role_id: str) -> AgentRole | None:
@@ -233,6 +265,14 @@ class RoleRegistry:
         """Get persona by ID."""
         return self._personas.get(persona_id)
 
+    def get_role_by_name(self, name: str) -> AgentRole | None:
+        """Get role by name (case-insensitive)."""
+        return self._roles_by_name.get(name.lower())
+
+    def get_persona_by_name(self, name: str) -> Persona | None:
+        """Get persona by name (case-insensitive)."""
+        return self._personas_by_name.get(name.lower())
+
     def list_roles(self) -> list[AgentRole]:
         """List all roles."""
         return list(self._roles.values())
@@ -325,22 +365,14 @@ class PersonaManager:
         return persona
 
 
-# Global instances
-_role_registry: RoleRegistry | None = None
-_persona_manager: PersonaManager | None = None
-
-
+# Global instances, created on first use
+@lru_cache(maxsize=1)
 def get_role_registry() -> RoleRegistry:
     """Get global role registry."""
-    global _role_registry
-    if _role_registry is None:
-        _role_registry = RoleRegistry()
-    return _role_registry
+    return RoleRegistry()
 
 
+@lru_cache(maxsize=1)
 def get_persona_manager() -> PersonaManager:
     """Get global persona manager."""
-    global _persona_manager
-    if _persona_manager is None:
-        _persona_manager = PersonaManager()
-    return _persona_manager
+    return PersonaManager()
@@ -5,10 +5,15 @@ Reference: "Routine: A Structural Planning Framework for LLM Agent System"
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import re
+from collections import OrderedDict, deque
+from dataclasses import field
 from enum import Enum
 from typing import Any
 
+from ..decorators import slotted_dataclass
+from ..id_generator import generate_hex_id
+
 
 class TaskType(Enum):
     """Task type classification."""
@@ -22,6 +27,23 @@ class TaskType(Enum):
     UNKNOWN = "unknown"
 
 
+# Classification keywords, checked in priority order
+_TASK_KEYWORDS = {
+    TaskType.QUESTION_ANSWER: ("what", "how", "why", "when", "where", "which", "?"),
+    TaskType.INFORMATION_RETRIEVAL: ("find", "search", "look for", "retrieve", "get"),
+    TaskType.TEXT_GENERATION: ("write", "generate", "create", "compose", "draft"),
+    TaskType.ANALYSIS: ("analyze", "compare", "evaluate", "assess", "review"),
+    TaskType.REASONING: ("reason", "infer", "deduce", "conclude", "explain"),
+}
+_KEYWORD_PRIORITY = tuple(_TASK_KEYWORDS)
+_KEYWORD_TYPES = {kw: task_type for task_type, kws in _TASK_KEYWORDS.items() for kw in kws}
+# Lookahead finds keywords starting at every offset in one pass, so
+# overlapping keywords are all seen (no keyword is a prefix of another)
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(kw) for kw in _KEYWORD_TYPES) + "))"
+)
+
+
 class StepStatus(Enum):
     """Step execution status."""
 
@@ -32,7 +54,7 @@ class StepStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@slotted_dataclass
 class TaskStep:
     """A single step in the execution plan."""
 
@@ -51,7 +73,7 @@ class TaskStep:
         return all(dep in completed_steps for dep in self.dependencies)
 
 
-@dataclass
+@slotted_dataclass
 class ExecutionPlan:
     """Complete execution plan for a task."""
 
@@ -61,22 +83,141 @@ class ExecutionPlan:
     steps: list[TaskStep] = field(default_factory=list)
     context: dict[str, Any] = field(default_factory=dict)
     created_at: str = ""
+    # Id -> position in steps, with the list object and length it was built for
+    _step_index: tuple[list[TaskStep], int, dict[str, int]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Kahn scheduling state, built on first use: unmet dependency counts,
+    # dependency id -> dependent step ids, and released step ids
+    _remaining: dict[str, int] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _reverse: dict[str, list[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _ready: deque[str] = field(
+        default_factory=deque, init=False, repr=False, compare=False
+    )
+    _completed_ids: set[str] = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
 
     def get_step(self, step_id: str) -> TaskStep | None:
-        """Get step by ID."""
-        for step in self.steps:
-            if step.step_id == step_id:
-                return step
-        return None
+        """Get step by ID.
 
-    def get_ready_steps(self, completed: set[str]) -> list[TaskStep]:
-        """Get steps that are ready to execute."""
+        Uses an id -> position index, rebuilt when steps is reassigned,
+        grows or shrinks, or the step at the indexed position no longer
+        has that id.
+        """
+        steps = self.steps
+        cached = self._step_index
+        if cached is None or cached[0] is not steps or cached[1] != len(steps):
+            cached = self._build_step_index()
+        pos = cached[2].get(step_id)
+        if pos is None or steps[pos].step_id != step_id:
+            pos = self._build_step_index()[2].get(step_id)
+            if pos is None:
+                return None
+        return steps[pos]
+
+    def _build_step_index(self) -> tuple[list[TaskStep], int, dict[str, int]]:
+        """Index step positions by id, keeping the first step for duplicate ids."""
+        positions: dict[str, int] = {}
+        for pos, step in enumerate(self.steps):
+            positions.setdefault(step.step_id, pos)
+        self._step_index = (self.steps, len(self.steps), positions)
+        return self._step_index
+
+    def get_ready_steps(self, completed: set[str] | None = None) -> list[TaskStep]:
+        """Get steps that are ready to execute.
+
+        Args:
+            completed: Completed step IDs. If None, steps released through
+                mark_completed are returned without rechecking dependencies.
+                Steps completed or reopened by setting status directly are
+                only picked up after resync().
+        """
+        if completed is not None:
+            return [
+                step for step in self.steps
+                if step.status == StepStatus.PENDING and step.can_execute(completed)
+            ]
+
+        if self._remaining is None or len(self._remaining) != len(self.steps):
+            self._build_schedule()
+
+        # Completed steps never become ready again, drop them
         ready = []
-        for step in self.steps:
-            if step.status == StepStatus.PENDING and step.can_execute(completed):
+        pending = deque()
+        for step_id in self._ready:
+            step = self.get_step(step_id)
+            if step is None or step.status is StepStatus.COMPLETED:
+                continue
+            pending.append(step_id)
+            if step.status is StepStatus.PENDING:
                 ready.append(step)
+        self._ready = pending
         return ready
 
+    def mark_completed(self, step_id: str) -> bool:
+        """Mark a step completed and release steps that depend on it.
+
+        Args:
+            step_id: Step to complete
+
+        Returns:
+            True if step was found
+        """
+        step = self.get_step(step_id)
+        if step is None:
+            return False
+
+        step.status = StepStatus.COMPLETED
+        if step_id in self._completed_ids:
+            return True
+        self._completed_ids.add(step_id)
+
+        if self._remaining is not None:
+            remaining = self._remaining
+            for child_id in self._reverse.pop(step_id, ()):
+                remaining[child_id] -= 1
+                if remaining[child_id] == 0:
+                    self._ready.append(child_id)
+        return True
+
+    def resync(self) -> None:
+        """Rebuild the schedule after step statuses were changed directly."""
+        self._remaining = None
+
+    def _build_schedule(self) -> None:
+        """Count unmet dependencies and queue steps that can already run."""
+        done = {step.step_id for step in self.steps if step.status is StepStatus.COMPLETED}
+        self._completed_ids = done
+        remaining: dict[str, int] = {}
+        reverse: dict[str, list[str]] = {}
+        ready: deque[str] = deque()
+        for step in self.steps:
+            step_id = step.step_id
+            if not step.dependencies:
+                remaining[step_id] = 0
+                ready.append(step_id)
+                continue
+
+            unmet = 0
+            for dep in step.dependencies:
+                if dep in done:
+                    continue
+                reverse.setdefault(dep, []).append(step_id)
+                unmet += 1
+
+            remaining[step_id] = unmet
+            if unmet == 0:
+                ready.append(step_id)
+
+        self._remaining = remaining
+        self._reverse = reverse
+        self._ready = ready
+
     def is_complete(self) -> bool:
         """Check if all steps are completed."""
         return all(s.status == StepStatus.COMPLETED for s in self.steps)
@@ -112,8 +253,14 @@ class TaskPlanner:
         TaskType.MULTI_STEP: ["intent_classification", "entity_extraction", "semantic_search", "matching"],
     }
 
+    # Maximum number of remembered request classifications
+    CLASSIFICATION_CACHE_SIZE = 1000
+
     def __init__(self) -> None:
         self.plans: dict[str, ExecutionPlan] = {}
+        self._step_templates: dict[TaskType, tuple[tuple[str, str, str], ...]] = {}
+        # (lowercased request, multi_step_expected) -> task type, in LRU order
+        self._classification_cache: OrderedDict[tuple[str, bool], TaskType] = OrderedDict()
 
     def plan(self, user_request: str, context: dict[str, Any] | None = None) -> ExecutionPlan:
         """Generate execution plan from user request.
@@ -125,13 +272,11 @@ class TaskPlanner:
         Returns:
             ExecutionPlan with structured steps
         """
-        import uuid
-
-        plan_id = str(uuid.uuid4())[:8]
+        plan_id = generate_hex_id()
         context = context or {}
 
         # Classify task type
-        task_type = self._classify_task(user_request, context)
+        task_type = self._classify_cached(user_request, context)
 
         # Generate steps
         steps = self._generate_steps(task_type, user_request, context)
@@ -147,32 +292,37 @@ class TaskPlanner:
         self.plans[plan_id] = plan
         return plan
 
+    def _classify_cached(self, request: str, context: dict) -> TaskType:
+        """Classify the task type, reusing results for repeated requests."""
+        key = (request.lower(), bool(context.get("multi_step_expected")))
+        cache = self._classification_cache
+        task_type = cache.get(key)
+        if task_type is not None:
+            cache.move_to_end(key)
+            return task_type
+
+        task_type = self._classify_task(request, context)
+        cache[key] = task_type
+        if len(cache) > self.CLASSIFICATION_CACHE_SIZE:
+            cache.popitem(last=False)
+        return task_type
+
     def _classify_task(self, request: str, context: dict) -> TaskType:
         """Classify the task type based on request and context."""
         request_lower = request.lower()
+        matched = {_KEYWORD_TYPES[m.group(1)] for m in _KEYWORD_RE.finditer(request_lower)}
 
         # Question detection
-        if any(q in request_lower for q in ["what", "how", "why", "when", "where", "which", "?"]):
+        if TaskType.QUESTION_ANSWER in matched:
             # Check if it's multi-step
             if len(request.split()) > 50 or "and" in request_lower or "then" in request_lower:
                 return TaskType.MULTI_STEP
             return TaskType.QUESTION_ANSWER
 
-        # Information retrieval
-        if any(k in request_lower for k in ["find", "search", "look for", "retrieve", "get"]):
-            return TaskType.INFORMATION_RETRIEVAL
-
-        # Text generation
-        if any(k in request_lower for k in ["write", "generate", "create", "compose", "draft"]):
-            return TaskType.TEXT_GENERATION
-
-        # Analysis
-        if any(k in request_lower for k in ["analyze", "compare", "evaluate", "assess", "review"]):
-            return TaskType.ANALYSIS
-
-        # Reasoning
-        if any(k in request_lower for k in ["reason", "infer", "deduce", "conclude", "explain"]):
-            return TaskType.REASONING
+        # Information retrieval, text generation, analysis, reasoning
+        for task_type in _KEYWORD_PRIORITY[1:]:
+            if task_type in matched:
+                return task_type
 
         # Multi-step
         if context.get("multi_step_expected"):
@@ -181,27 +331,49 @@ class TaskPlanner:
         return TaskType.UNKNOWN
 
     def _generate_steps(self, task_type: TaskType, request: str, context: dict) -> list[TaskStep]:
-        """Generate execution steps based on task type."""
-        import uuid
+        """Generate execution steps based on task type.
+
+        Steps come from a per-task-type template; only ids and the
+        dependency chain are created per call.
+        """
+        template = self._step_template(task_type)
+        # Draw every step id at once, 8 hex characters each
+        ids = generate_hex_id(4 * len(template))
 
         steps = []
+        for i, (name, description, agent) in enumerate(template):
+            # Set dependencies (previous step)
+            dependencies = [steps[-1].step_id] if steps else []
+
+            step = TaskStep(
+                step_id=ids[8 * i:8 * i + 8],
+                name=name,
+                description=description,
+                agent_type=agent,
+                dependencies=dependencies,
+            )
+            steps.append(step)
+
+        return steps
+
+    def _step_template(self, task_type: TaskType) -> tuple[tuple[str, str, str], ...]:
+        """Get (name, description, agent_type) for each step of a task type."""
+        template = self._step_templates.get(task_type)
+        if template is None:
+            template = self._step_templates[task_type] = self._build_step_template(task_type)
+        return template
+
+    def _build_step_template(self, task_type: TaskType) -> tuple[tuple[str, str, str], ...]:
+        """Build the step template for a task type."""
         required_agents = self.TASK_REQUIREMENTS.get(task_type, [])
 
         if not required_agents:
             # Default: single step with intent classification
-            return [
-                TaskStep(
-                    step_id=str(uuid.uuid4())[:8],
-                    name="classify_intent",
-                    description="Classify user intent",
-                    agent_type="intent_classification",
-                )
-            ]
+            return (("classify_intent", "Classify user intent", "intent_classification"),)
 
         # Generate steps for each required agent
+        template = []
         for i, agent in enumerate(required_agents):
-            step_id = str(uuid.uuid4())[:8]
-
             # Determine step name and description
             if agent == "intent_classification":
                 name = "classify_intent"
@@ -225,19 +397,9 @@ class TaskPlanner:
                 name = f"step_{i}"
                 description = f"Execute {agent} task"
 
-            # Set dependencies (previous step)
-            dependencies = [steps[-1].step_id] if steps else []
+            template.append((name, description, agent))
 
-            step = TaskStep(
-                step_id=step_id,
-                name=name,
-                description=description,
-                agent_type=agent,
-                dependencies=dependencies,
-            )
-            steps.append(step)
-
-        return steps
+        return tuple(template)
 
     def get_plan(self, plan_id: str) -> ExecutionPlan | None:
         """Get plan by ID."""
@@ -255,9 +417,15 @@ class TaskPlanner:
         if not step:
             return False
 
+        previous = step.status
         step.status = status
         step.output = output
         step.error = error
+        if status is StepStatus.COMPLETED:
+            plan.mark_completed(step_id)
+        elif previous is StepStatus.COMPLETED:
+            # Reopened steps block their dependents again
+            plan.resync()
         return True
 
 
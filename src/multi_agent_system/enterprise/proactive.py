@@ -5,24 +5,47 @@ Reference: "ProAgent: Harnessing On-Demand Sensory Contexts for Proactive LLM Ag
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any
+from collections import deque
+from dataclasses import field
+from typing import Any, Iterator
 
+from ..decorators import slotted_dataclass
 
-@dataclass
+# Number of recent queries remembered per user
+MAX_RECENT_QUERIES = 10
+# A prediction this confident is not worth comparing against the rest
+CONFIDENT_PREDICTION = 0.9
+
+
+@slotted_dataclass
 class UserContext:
-    """User context for proactive predictions."""
+    """User context for proactive predictions.
+
+    recent_queries is a bounded deque rather than a list, so it supports
+    indexing but not slicing; use get_recent_queries() for a list copy.
+    """
 
     user_id: str | None = None
-    recent_queries: list[str] = field(default_factory=list)
+    recent_queries: deque[str] = field(
+        default_factory=lambda: deque(maxlen=MAX_RECENT_QUERIES)
+    )
     session_history: list[dict] = field(default_factory=list)
     explicit_preferences: dict[str, Any] = field(default_factory=dict)
     implicit_preferences: dict[str, Any] = field(default_factory=dict)
     time_context: str = ""  # morning, afternoon, evening, etc.
     device_context: str = ""  # mobile, desktop, etc.
 
+    def __post_init__(self) -> None:
+        # Queries passed in as a list still get the MAX_RECENT_QUERIES bound
+        if not isinstance(self.recent_queries, deque) or self.recent_queries.maxlen != MAX_RECENT_QUERIES:
+            self.recent_queries = deque(self.recent_queries, maxlen=MAX_RECENT_QUERIES)
 
-@dataclass
+    def get_recent_queries(self) -> list[str]:
+        """Get recent queries as a list, oldest first."""
+        return list(self.recent_queries)
+
+
+@slotted_dataclass
 class PredictedNeed:
     """A predicted user need."""
 
@@ -49,80 +72,99 @@ class ProactiveLayer:
             self.user_contexts[user_id] = UserContext(user_id=user_id)
 
         user_ctx = self.user_contexts[user_id]
+        # Oldest queries are evicted once MAX_RECENT_QUERIES is reached
         user_ctx.recent_queries.append(query)
 
-        # Keep only recent queries
-        if len(user_ctx.recent_queries) > 10:
-            user_ctx.recent_queries = user_ctx.recent_queries[-10:]
-
         if context:
             user_ctx.session_history.append(context)
 
     def predict_needs(self, user_id: str) -> list[PredictedNeed]:
         """Predict user needs based on context."""
-        if user_id not in self.user_contexts:
+        user_ctx = self.user_contexts.get(user_id)
+        if user_ctx is None:
             return []
+        return list(self._iter_predictions(user_ctx))
+
+    def predict_needs_batch(self, user_ids: list[str]) -> list[list[PredictedNeed]]:
+        """Predict needs for many users at once.
+
+        Args:
+            user_ids: Users to predict for
+
+        Returns:
+            Predictions per user, in the order of user_ids
+        """
+        contexts = self.user_contexts
+        iter_predictions = self._iter_predictions
+        results = []
+        for user_id in user_ids:
+            user_ctx = contexts.get(user_id)
+            results.append([] if user_ctx is None else list(iter_predictions(user_ctx)))
+        return results
+
+    def predict_best(self, user_id: str) -> PredictedNeed | None:
+        """Predict the single most confident user need.
+
+        Patterns are checked in order and the walk stops at the first
+        prediction of at least CONFIDENT_PREDICTION; ties keep the earliest.
+        """
+        user_ctx = self.user_contexts.get(user_id)
+        if user_ctx is None:
+            return None
 
-        user_ctx = self.user_contexts[user_id]
-        predictions = []
+        best = None
+        for prediction in self._iter_predictions(user_ctx):
+            if best is None or prediction.confidence > best.confidence:
+                best = prediction
+                if best.confidence >= CONFIDENT_PREDICTION:
+                    break
+        return best
 
+    def _iter_predictions(self, user_ctx: UserContext) -> Iterator[PredictedNeed]:
+        """Yield predictions for each pattern the user context triggers."""
         # Pattern 1: Follow-up queries
         if len(user_ctx.recent_queries) >= 2:
             last_query = user_ctx.recent_queries[-1]
-            second_last = user_ctx.recent_queries[-2]
 
             # User asked about X, might want more details
-            predictions.append(
-                PredictedNeed(
-                    need_id="follow_up",
-                    description=f"User might want more details about: {last_query}",
-                    confidence=0.6,
-                    suggested_actions=["provide_more_details", "offer_related_topics"],
-                )
+            yield PredictedNeed(
+                need_id="follow_up",
+                description=f"User might want more details about: {last_query}",
+                confidence=0.6,
+                suggested_actions=["provide_more_details", "offer_related_topics"],
             )
 
         # Pattern 2: Time-based predictions
         if user_ctx.time_context == "morning":
-            predictions.append(
-                PredictedNeed(
-                    need_id="daily_brief",
-                    description="User might want a daily summary or briefing",
-                    confidence=0.4,
-                    suggested_actions=["offer_daily_summary"],
-                )
+            yield PredictedNeed(
+                need_id="daily_brief",
+                description="User might want a daily summary or briefing",
+                confidence=0.4,
+                suggested_actions=["offer_daily_summary"],
             )
 
         # Pattern 3: Preference-based
         if user_ctx.explicit_preferences.get("interested_topics"):
-            predictions.append(
-                PredictedNeed(
-                    need_id="personalized_recommendations",
-                    description="User might be interested in new content in their topics",
-                    confidence=0.7,
-                    suggested_actions=["recommend_related_content"],
-                )
+            yield PredictedNeed(
+                need_id="personalized_recommendations",
+                description="User might be interested in new content in their topics",
+                confidence=0.7,
+                suggested_actions=["recommend_related_content"],
             )
 
-        return predictions
-
     def suggest_actions(self, predictions: list[PredictedNeed]) -> list[str]:
-        """Get suggested proactive actions."""
-        actions = []
+        """Get suggested proactive actions, deduplicated in first-seen order."""
+        actions: dict[str, None] = {}
         for pred in predictions:
             if pred.confidence > 0.5:
-                actions.extend(pred.suggested_actions)
-        return list(set(actions))
+                actions.update(dict.fromkeys(pred.suggested_actions))
+        return list(actions)
 
     def get_proactive_suggestion(self, user_id: str) -> str | None:
         """Get a proactive suggestion for the user."""
-        predictions = self.predict_needs(user_id)
-
-        if not predictions:
-            return None
-
         # Return highest confidence prediction
-        best = max(predictions, key=lambda p: p.confidence)
-        if best.confidence > 0.5:
+        best = self.predict_best(user_id)
+        if best is not None and best.confidence > 0.5:
             return f"Suggestion: {best.description}"
 
         return None
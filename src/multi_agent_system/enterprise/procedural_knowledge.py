@@ -6,18 +6,69 @@ domain-dependent procedural guidance for complex tasks.
 
 from __future__ import annotations
 
-import json
+import os
 import uuid
-from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import field
 from datetime import datetime
+from itertools import count
+from operator import attrgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+from ..decorators import slotted_dataclass
+from ..id_generator import generate_hex_id
+from ..json_utils import dumps, loads
 
-@dataclass
+
+# Sort key putting procedure steps in execution order
+_STEP_ORDER = attrgetter("order")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file via a temporary sibling so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _unlink(path: Path) -> None:
+    """Remove a file if it exists."""
+    if path.exists():
+        path.unlink()
+
+
+def _to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to integer microseconds since the epoch."""
+    return round(value.timestamp() * 1_000_000)
+
+
+def _from_stored_time(value: Any) -> datetime:
+    """Parse a stored timestamp: epoch microseconds, or ISO text from older files."""
+    if value is None:
+        return datetime.now()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value / 1_000_000)
+
+
+def _trigrams(text: str) -> set[str]:
+    """Get the set of three-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _read_file(path: Path) -> bytes | Exception:
+    """Read a file, returning the error instead of raising it."""
+    try:
+        return path.read_bytes()
+    except Exception as e:
+        return e
+
+
+@slotted_dataclass
 class ProcedureStep:
     """A single step in a procedure."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=generate_hex_id)
     order: int = 0
     action: str = ""
     description: str = ""
@@ -25,9 +76,10 @@ class ProcedureStep:
     conditions: list[str] = field(default_factory=list)  # Preconditions
     expected_output: str = ""  # What this step should produce
     error_handling: str = ""  # How to handle errors
+    depends_on: list[str] = field(default_factory=list)  # Step IDs this depends on
 
 
-@dataclass
+@slotted_dataclass
 class Procedure:
     """A procedure representing a domain-specific workflow."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -41,13 +93,36 @@ class Procedure:
     metadata: dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
+    # Id -> position in steps, with the list object and length it was built for
+    _step_index: tuple[list[ProcedureStep], int, dict[str, int]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def get_step(self, step_id: str) -> ProcedureStep | None:
-        """Get step by ID."""
-        for step in self.steps:
-            if step.id == step_id:
-                return step
-        return None
+        """Get step by ID.
+
+        Uses an id -> position index, rebuilt when steps is reassigned,
+        grows or shrinks, or the step at the indexed position no longer
+        has that id.
+        """
+        steps = self.steps
+        cached = self._step_index
+        if cached is None or cached[0] is not steps or cached[1] != len(steps):
+            cached = self._build_step_index()
+        pos = cached[2].get(step_id)
+        if pos is None or steps[pos].id != step_id:
+            pos = self._build_step_index()[2].get(step_id)
+            if pos is None:
+                return None
+        return steps[pos]
+
+    def _build_step_index(self) -> tuple[list[ProcedureStep], int, dict[str, int]]:
+        """Index step positions by id, keeping the first step for duplicate ids."""
+        positions: dict[str, int] = {}
+        for pos, step in enumerate(self.steps):
+            positions.setdefault(step.id, pos)
+        self._step_index = (self.steps, len(self.steps), positions)
+        return self._step_index
 
     def validate(self) -> list[str]:
         """Validate procedure structure.
@@ -63,12 +138,15 @@ class Procedure:
         if not self.steps:
             errors.append("Procedure must have at least one step")
 
-        # Check for circular dependencies
+        # Check for unknown and circular dependencies
         step_ids = {s.id for s in self.steps}
         for step in self.steps:
-            for dep in step.depends_on if hasattr(step, 'depends_on') else []:
+            for dep in step.depends_on:
                 if dep not in step_ids:
                     errors.append(f"Step {step.id} depends on unknown step {dep}")
+        errors.extend(
+            f"Circular dependency via step {step_id}" for step_id in self._find_cycles()
+        )
 
         # Check step order
         orders = [s.order for s in self.steps]
@@ -77,35 +155,186 @@ class Procedure:
 
         return errors
 
+    def _find_cycles(self) -> list[str]:
+        """Find dependency cycles with an iterative depth-first search.
+
+        Returns:
+            For each cycle found, the id of the step that closes it
+        """
+        adjacency: dict[str, list[str]] = {}
+        for step in self.steps:
+            adjacency.setdefault(step.id, []).extend(step.depends_on)
+
+        # Unvisited ids are absent; 1 = on the current path, 2 = finished
+        state: dict[str, int] = {}
+        cycles = []
+        for root in adjacency:
+            if root in state:
+                continue
+            state[root] = 1
+            stack = [(root, iter(adjacency[root]))]
+            while stack:
+                node, deps = stack[-1]
+                for dep in deps:
+                    if dep not in adjacency:
+                        continue  # Reported as an unknown step
+                    seen = state.get(dep)
+                    if seen is None:
+                        state[dep] = 1
+                        stack.append((dep, iter(adjacency[dep])))
+                        break
+                    if seen == 1:
+                        cycles.append(node)
+                else:
+                    state[node] = 2
+                    stack.pop()
+        return cycles
+
 
 class ProcedureRegistry:
     """Registry for managing procedures.
 
     Provides storage, retrieval, and versioning for procedures.
+
+    Domain, name and text lookups use each procedure's fields as of its
+    last register() or reindex(); edits made to a registered procedure
+    are only found after calling one of them.
     """
 
-    def __init__(self, storage_path: str = "./data/procedures") -> None:
+    # Maximum threads used to read procedure files
+    LOAD_WORKERS = 8
+
+    def __init__(
+        self,
+        storage_path: str = "./data/procedures",
+        background_writes: bool = False,
+    ) -> None:
         """Initialize procedure registry.
 
         Args:
             storage_path: Path to store procedure definitions
+            background_writes: Write files on a background thread instead of
+                in register()/delete(); call flush() to wait for them
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self._procedures: dict[str, Procedure] = {}
-        self._load_all()
+        # Lookup indexes over procedures as of their last register(); results
+        # are returned in _procedures order using the insertion sequence
+        self._order: dict[str, int] = {}
+        self._sequence = count()
+        self._lowered: dict[str, tuple[str, str, str]] = {}  # id -> name, description, domain
+        self._indexed_domain: dict[str, str] = {}  # id -> domain key in _by_domain
+        self._by_domain: dict[str, set[str]] = {}
+        self._name_trigrams: dict[str, set[str]] = {}
+        self._text_trigrams: dict[str, set[str]] = {}
+        # A single worker keeps file operations in submission order
+        self._writer = ThreadPoolExecutor(max_workers=1) if background_writes else None
+        self._pending_writes: list[Future] = []
+        # Stored files not parsed yet, keyed by file stem (the procedure id
+        # for files written by register); parsed on first access
+        self._unloaded: dict[str, Path] = {
+            path.stem: path for path in self.storage_path.glob("*.json")
+        }
 
     def _load_all(self) -> None:
-        """Load all procedures from storage."""
-        for file_path in self.storage_path.glob("*.json"):
+        """Load all procedures not yet parsed from storage."""
+        if self._unloaded:
+            paths = list(self._unloaded.values())
+            self._unloaded.clear()
+            self._load_files(paths)
+
+    def _load(self, procedure_id: str) -> None:
+        """Make sure the procedure with this id is loaded, if it is stored."""
+        if procedure_id in self._procedures or not self._unloaded:
+            return
+        path = self._unloaded.pop(procedure_id, None)
+        if path is not None:
+            self._load_files([path])
+        if procedure_id not in self._procedures:
+            # Stored under a different file name
+            self._load_all()
+
+    def _load_files(self, paths: list[Path]) -> None:
+        """Parse procedure files into the registry.
+
+        Files are read concurrently; parsing stays on this thread so
+        procedures are registered in directory order. Procedures already
+        in memory are newer than their files and are kept.
+        """
+        if len(paths) > 1:
+            workers = min(self.LOAD_WORKERS, len(paths))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                blobs = list(pool.map(_read_file, paths))
+        else:
+            blobs = [_read_file(path) for path in paths]
+
+        for file_path, blob in zip(paths, blobs):
             try:
-                with open(file_path, encoding="utf-8") as f:
-                    data = json.load(f)
-                    proc = self._deserialize_procedure(data)
-                    self._procedures[proc.id] = proc
+                if isinstance(blob, Exception):
+                    raise blob
+                proc = self._deserialize_procedure(loads(blob))
+                if proc.id not in self._procedures:
+                    self._add(proc)
             except Exception as e:
                 print(f"Error loading {file_path}: {e}")
 
+    def _add(self, proc: Procedure) -> None:
+        """Store a procedure and index it, replacing any previous version."""
+        if proc.id in self._procedures:
+            self._unindex(proc.id)
+        else:
+            self._order[proc.id] = next(self._sequence)
+        self._procedures[proc.id] = proc
+
+        lowered = (proc.name.lower(), proc.description.lower(), proc.domain.lower())
+        self._lowered[proc.id] = lowered
+        self._indexed_domain[proc.id] = proc.domain
+        self._by_domain.setdefault(proc.domain, set()).add(proc.id)
+        for gram in _trigrams(lowered[0]):
+            self._name_trigrams.setdefault(gram, set()).add(proc.id)
+        for gram in set().union(*map(_trigrams, lowered)):
+            self._text_trigrams.setdefault(gram, set()).add(proc.id)
+
+    def _unindex(self, procedure_id: str) -> None:
+        """Remove a procedure from the lookup indexes."""
+        # Procedures may have been edited since they were indexed, so use
+        # the indexed values rather than the live fields
+        lowered = self._lowered.pop(procedure_id)
+        self._discard(self._by_domain, self._indexed_domain.pop(procedure_id), procedure_id)
+        for gram in _trigrams(lowered[0]):
+            self._discard(self._name_trigrams, gram, procedure_id)
+        for gram in set().union(*map(_trigrams, lowered)):
+            self._discard(self._text_trigrams, gram, procedure_id)
+
+    @staticmethod
+    def _discard(index: dict[str, set[str]], key: str, procedure_id: str) -> None:
+        """Remove an id from an index bucket, dropping the bucket when empty."""
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(procedure_id)
+            if not ids:
+                del index[key]
+
+    def _candidates(self, index: dict[str, set[str]], query: str) -> list[str] | None:
+        """Get ids whose indexed text contains every trigram of query.
+
+        Returns:
+            Candidate ids in registration order, or None if query is too
+            short to be narrowed by trigrams
+        """
+        if len(query) < 3:
+            return None
+
+        postings = []
+        for gram in _trigrams(query):
+            ids = index.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+        return sorted(postings[0].intersection(*postings[1:]), key=self._order.__getitem__)
+
     def _get_file_path(self, procedure_id: str) -> Path:
         """Get file path for procedure."""
         return self.storage_path / f"{procedure_id}.json"
@@ -128,14 +357,15 @@ class ProcedureRegistry:
                     "conditions": s.conditions,
                     "expected_output": s.expected_output,
                     "error_handling": s.error_handling,
+                    "depends_on": s.depends_on,
                 }
                 for s in proc.steps
             ],
             "prerequisites": proc.prerequisites,
             "outputs": proc.outputs,
             "metadata": proc.metadata,
-            "created_at": proc.created_at.isoformat(),
-            "updated_at": proc.updated_at.isoformat(),
+            "created_at": _to_epoch_us(proc.created_at),
+            "updated_at": _to_epoch_us(proc.updated_at),
         }
 
     def _deserialize_procedure(self, data: dict[str, Any]) -> Procedure:
@@ -151,6 +381,7 @@ class ProcedureRegistry:
                 conditions=s.get("conditions", []),
                 expected_output=s.get("expected_output", ""),
                 error_handling=s.get("error_handling", ""),
+                depends_on=s.get("depends_on", []),
             )
             steps.append(step)
 
@@ -164,8 +395,8 @@ class ProcedureRegistry:
             prerequisites=data.get("prerequisites", []),
             outputs=data.get("outputs", []),
             metadata=data.get("metadata", {}),
-            created_at=datetime.fromisoformat(data.get("created_at", datetime.now().isoformat())),
-            updated_at=datetime.fromisoformat(data.get("updated_at", datetime.now().isoformat())),
+            created_at=_from_stored_time(data.get("created_at")),
+            updated_at=_from_stored_time(data.get("updated_at")),
         )
 
     def register(self, procedure: Procedure) -> Procedure:
@@ -178,49 +409,103 @@ class ProcedureRegistry:
             Registered procedure
         """
         procedure.updated_at = datetime.now()
-        self._procedures[procedure.id] = procedure
+        self._unloaded.pop(procedure.id, None)
+        procedure._step_index = None
+        self._add(procedure)
 
-        # Save to file
-        file_path = self._get_file_path(procedure.id)
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(self._serialize_procedure(procedure), f, ensure_ascii=False, indent=2)
+        # Save to file; serialized now so later edits do not race the write
+        data = dumps(self._serialize_procedure(procedure), indent=True, non_str_keys=True)
+        self._submit_write(_write_atomic, self._get_file_path(procedure.id), data)
 
         return procedure
 
+    def reindex(self, procedure_id: str) -> bool:
+        """Refresh the lookup indexes of a procedure edited in memory.
+
+        Unlike register(), this neither stores the procedure nor bumps
+        updated_at.
+
+        Args:
+            procedure_id: Procedure to reindex
+
+        Returns:
+            True if procedure was found
+        """
+        self._load(procedure_id)
+        proc = self._procedures.get(procedure_id)
+        if proc is None:
+            return False
+        self._add(proc)
+        return True
+
+    def _submit_write(self, func: Callable[..., None], *args: Any) -> None:
+        """Run a file operation now, or queue it on the background writer."""
+        if self._writer is None:
+            func(*args)
+            return
+
+        self._pending_writes = [f for f in self._pending_writes if not f.done()]
+        self._pending_writes.append(self._writer.submit(func, *args))
+
+    def flush(self) -> None:
+        """Wait for queued background writes and re-raise the first error."""
+        pending, self._pending_writes = self._pending_writes, []
+        wait(pending)
+        for future in pending:
+            future.result()
+
     def get(self, procedure_id: str) -> Procedure | None:
         """Get procedure by ID."""
+        self._load(procedure_id)
         return self._procedures.get(procedure_id)
 
     def find_by_domain(self, domain: str) -> list[Procedure]:
         """Find procedures by domain."""
-        return [p for p in self._procedures.values() if p.domain == domain]
+        self._load_all()
+        ids = self._by_domain.get(domain, ())
+        return [self._procedures[i] for i in sorted(ids, key=self._order.__getitem__)]
 
     def find_by_name(self, name: str) -> list[Procedure]:
         """Find procedures by name (partial match)."""
-        return [p for p in self._procedures.values() if name.lower() in p.name.lower()]
+        self._load_all()
+        name_lower = name.lower()
+        candidates = self._candidates(self._name_trigrams, name_lower)
+        if candidates is None:
+            candidates = self._procedures
+        return [
+            self._procedures[i] for i in candidates
+            if name_lower in self._lowered[i][0]
+        ]
 
     def search(self, query: str) -> list[Procedure]:
         """Search procedures by query."""
+        self._load_all()
         query_lower = query.lower()
-        results = []
-        for proc in self._procedures.values():
-            if (query_lower in proc.name.lower() or
-                query_lower in proc.description.lower() or
-                query_lower in proc.domain.lower()):
-                results.append(proc)
-        return results
+        candidates = self._candidates(self._text_trigrams, query_lower)
+        if candidates is None:
+            candidates = self._procedures
+        return [
+            self._procedures[i] for i in candidates
+            if any(query_lower in text for text in self._lowered[i])
+        ]
+
+    def is_empty(self) -> bool:
+        """Check whether no procedures are registered or stored."""
+        return not self._procedures and not self._unloaded
 
     def list_all(self) -> list[Procedure]:
         """List all procedures."""
+        self._load_all()
         return list(self._procedures.values())
 
     def delete(self, procedure_id: str) -> bool:
         """Delete a procedure."""
+        self._load(procedure_id)
         if procedure_id in self._procedures:
+            self._unindex(procedure_id)
             del self._procedures[procedure_id]
-            file_path = self._get_file_path(procedure_id)
-            if file_path.exists():
-                file_path.unlink()
+            del self._order[procedure_id]
+            self._submit_write(_unlink, self._get_file_path(procedure_id))
             return True
         return False
 
@@ -241,7 +526,7 @@ class ProceduralKnowledge:
 
     def _load_default_procedures(self) -> None:
         """Load default procedures if none exist."""
-        if not self.registry.list_all():
+        if self.registry.is_empty():
             # Add some default procedures
             self._add_default_procedures()
 
@@ -352,7 +637,7 @@ class ProceduralKnowledge:
                 "expected_output": step.expected_output,
                 "error_handling": step.error_handling,
             }
-            for step in sorted(proc.steps, key=lambda s: s.order)
+            for step in sorted(proc.steps, key=_STEP_ORDER)
         ]
 
     def get_next_step(
@@ -373,17 +658,24 @@ class ProceduralKnowledge:
         if not proc:
             return None
 
-        for step in sorted(proc.steps, key=lambda s: s.order):
-            if step.id not in completed_steps:
-                return {
-                    "step_id": step.id,
-                    "action": step.action,
-                    "description": step.description,
-                    "parameters": step.parameters,
-                    "expected_output": step.expected_output,
-                }
+        # First remaining step in order; min keeps the earliest of equal
+        # orders, as a stable sort would, without sorting every step
+        completed = set(completed_steps)
+        step = min(
+            (step for step in proc.steps if step.id not in completed),
+            key=_STEP_ORDER,
+            default=None,
+        )
+        if step is None:
+            return None  # All steps complete
 
-        return None  # All steps complete
+        return {
+            "step_id": step.id,
+            "action": step.action,
+            "description": step.description,
+            "parameters": step.parameters,
+            "expected_output": step.expected_output,
+        }
 
 
 # Global instance
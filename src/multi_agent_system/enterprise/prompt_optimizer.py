@@ -6,12 +6,18 @@ Provides tools for analyzing, optimizing, and testing prompts.
 
 from __future__ import annotations
 
+import re
+import string
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Callable
 
+_VAR_RE = re.compile(r"\{(\w+)\}")
+_FORMATTER = string.Formatter()
+
 
 class PromptType(Enum):
     """Types of prompts."""
@@ -52,13 +58,47 @@ class PromptTemplate:
     updated_at: datetime = field(default_factory=datetime.now)
 
     def render(self, **kwargs) -> str:
-        """Render template with variables."""
-        return self.template.format(**kwargs)
+        """Render template with variables.
+
+        Same result as str.format; templates are parsed once and cached.
+        """
+        segments = _compile_template(self.template)
+        if segments is None:
+            return self.template.format(**kwargs)
+        return "".join([
+            literal if name is None else literal + format(kwargs[name])
+            for literal, name in segments
+        ])
 
     def get_variables(self) -> list[str]:
         """Extract variables from template."""
-        import re
-        return re.findall(r'\{(\w+)\}', self.template)
+        return list(_template_variables(self.template))
+
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> tuple[tuple[str, str | None], ...] | None:
+    """Split a format string into (literal, variable name) segments.
+
+    Returns:
+        Segments to join, or None if the template uses positional fields,
+        attribute/index access, conversions or format specs, which are
+        left to str.format
+    """
+    segments = []
+    for literal, name, spec, conversion in _FORMATTER.parse(template):
+        if name is None:
+            segments.append((literal, None))
+        elif name.isidentifier() and not spec and conversion is None:
+            segments.append((literal, name))
+        else:
+            return None
+    return tuple(segments)
+
+
+@lru_cache(maxsize=256)
+def _template_variables(template: str) -> tuple[str, ...]:
+    """Find {name} variables in a template, in order of appearance."""
+    return tuple(_VAR_RE.findall(template))
 
 
 @dataclass
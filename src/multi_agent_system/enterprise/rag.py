@@ -7,7 +7,10 @@ from __future__ import annotations
 
 import json
 from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
+from heapq import nlargest
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -62,6 +65,71 @@ class KnowledgeSource(ABC):
         """Retrieve relevant chunks."""
         pass
 
+    def retrieve_batch(self, queries: list[str], top_k: int = 5) -> list[list[RetrievedChunk]]:
+        """Retrieve relevant chunks for several queries, in query order.
+
+        Sources with a cheaper bulk path can override this.
+        """
+        return [self.retrieve(query, top_k) for query in queries]
+
+
+class _TextIndex:
+    """Lowercased documents with a trigram index for substring lookups."""
+
+    # Maximum number of remembered per-word matches
+    WORD_CACHE_SIZE = 4096
+
+    def __init__(self, texts: list[str]) -> None:
+        self.texts = texts
+        self._trigrams: dict[str, list[int]] = {}  # trigram -> ascending doc indexes
+        for i, text in enumerate(texts):
+            for gram in {text[j:j + 3] for j in range(len(text) - 2)}:
+                self._trigrams.setdefault(gram, []).append(i)
+        # Documents never change, so matches are reused, in LRU order
+        self._word_cache: OrderedDict[str, list[int]] = OrderedDict()
+
+    def containing(self, word: str) -> list[int]:
+        """Get indexes of documents containing word, in ascending order."""
+        cache = self._word_cache
+        docs = cache.get(word)
+        if docs is not None:
+            cache.move_to_end(word)
+            return docs
+
+        docs = cache[word] = self._match(word)
+        if len(cache) > self.WORD_CACHE_SIZE:
+            cache.popitem(last=False)
+        return docs
+
+    def _match(self, word: str) -> list[int]:
+        """Find documents containing word using the trigram postings."""
+        texts = self.texts
+        if len(word) < 3:
+            return [i for i, text in enumerate(texts) if word in text]
+
+        postings = []
+        for gram in {word[j:j + 3] for j in range(len(word) - 2)}:
+            docs = self._trigrams.get(gram)
+            if not docs:
+                return []
+            postings.append(docs)
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [i for i in sorted(candidates) if word in texts[i]]
+
+    def top(self, query: str, top_k: int) -> list[tuple[int, float]]:
+        """Score documents by how many query words they contain.
+
+        Returns:
+            Up to top_k (doc index, score) pairs, best first; ties keep
+            document order
+        """
+        scores: dict[int, float] = {}
+        for word, count in Counter(query.lower().split()).items():
+            for i in self.containing(word):
+                scores[i] = scores.get(i, 0.0) + count
+        return nlargest(top_k, sorted(scores.items()), key=itemgetter(1))
+
 
 class VectorStoreSource(KnowledgeSource):
     """Vector store based retrieval."""
@@ -81,51 +149,46 @@ class PaperRepositorySource(KnowledgeSource):
     def __init__(self, papers_file: str = "./data/papers.json") -> None:
         self.papers_file = Path(papers_file)
         self._papers: list[dict] = []
+        self._index = _TextIndex([])
         self._load()
 
     def _load(self) -> None:
-        """Load papers."""
+        """Load papers and index their searchable text."""
         if self.papers_file.exists():
             with open(self.papers_file) as f:
                 self._papers = json.load(f)
-
-    def retrieve(self, query: str, top_k: int = 5) -> list[RetrievedChunk]:
-        """Retrieve from paper repository."""
-        query_lower = query.lower()
-        results = []
-
-        # Simple keyword matching (would use vector store in production)
-        for paper in self._papers:
-            score = 0.0
-            text = (
+        self._index = _TextIndex([
+            (
                 paper.get("title", "")
                 + " "
                 + paper.get("summary", "")
                 + " "
                 + " ".join(paper.get("authors", []))
             ).lower()
+            for paper in self._papers
+        ])
 
-            # Calculate simple relevance score
-            query_words = query_lower.split()
-            for word in query_words:
-                if word in text:
-                    score += 1.0
-
-            if score > 0:
-                content = f"Title: {paper.get('title')}\nAuthors: {', '.join(paper.get('authors', []))}\nAbstract: {paper.get('summary', '')[:300]}..."
-                results.append(
-                    RetrievedChunk(
-                        id=paper.get("id", ""),
-                        content=content,
-                        source="papers",
-                        score=score,
-                        metadata={"published": paper.get("published"), "categories": paper.get("categories", [])},
-                    )
-                )
+    def retrieve(self, query: str, top_k: int = 5) -> list[RetrievedChunk]:
+        """Retrieve from paper repository.
 
-        # Sort by score and return top_k
-        results.sort(key=lambda x: -x.score)
-        return results[:top_k]
+        Papers score one point per query word found in their title,
+        summary or authors (simple keyword matching; would use vector
+        store in production).
+        """
+        results = []
+        for i, score in self._index.top(query, top_k):
+            paper = self._papers[i]
+            content = f"Title: {paper.get('title')}\nAuthors: {', '.join(paper.get('authors', []))}\nAbstract: {paper.get('summary', '')[:300]}..."
+            results.append(
+                RetrievedChunk(
+                    id=paper.get("id", ""),
+                    content=content,
+                    source="papers",
+                    score=score,
+                    metadata={"published": paper.get("published"), "categories": paper.get("categories", [])},
+                )
+            )
+        return results
 
 
 class KnowledgeGraphSource(KnowledgeSource):
@@ -134,41 +197,34 @@ class KnowledgeGraphSource(KnowledgeSource):
     def __init__(self, graph_data_file: str = "./data/entities.json") -> None:
         self.graph_file = Path(graph_data_file)
         self._entities: list[dict] = []
+        self._index = _TextIndex([])
         self._load()
 
     def _load(self) -> None:
-        """Load entities."""
+        """Load entities and index their searchable text."""
         if self.graph_file.exists():
             with open(self.graph_file) as f:
                 self._entities = json.load(f)
+        self._index = _TextIndex([
+            (entity.get("name", "") + " " + entity.get("description", "")).lower()
+            for entity in self._entities
+        ])
 
     def retrieve(self, query: str, top_k: int = 5) -> list[RetrievedChunk]:
         """Retrieve from knowledge graph."""
-        query_lower = query.lower()
         results = []
-
-        for entity in self._entities:
-            score = 0.0
-            text = (entity.get("name", "") + " " + entity.get("description", "")).lower()
-
-            query_words = query_lower.split()
-            for word in query_words:
-                if word in text:
-                    score += 1.0
-
-            if score > 0:
-                results.append(
-                    RetrievedChunk(
-                        id=entity.get("id", ""),
-                        content=f"{entity.get('name')}: {entity.get('description', '')}",
-                        source="knowledge_graph",
-                        score=score,
-                        metadata={"type": entity.get("type")},
-                    )
+        for i, score in self._index.top(query, top_k):
+            entity = self._entities[i]
+            results.append(
+                RetrievedChunk(
+                    id=entity.get("id", ""),
+                    content=f"{entity.get('name')}: {entity.get('description', '')}",
+                    source="knowledge_graph",
+                    score=score,
+                    metadata={"type": entity.get("type")},
                 )
-
-        results.sort(key=lambda x: -x.score)
-        return results[:top_k]
+            )
+        return results
 
 
 class KnowledgeAugmentation:
@@ -211,21 +267,47 @@ class KnowledgeAugmentation:
         Returns:
             RetrievedContext with combined results
         """
+        return self.retrieve_batch([query], sources, top_k)[0]
+
+    def retrieve_batch(
+        self,
+        queries: list[str],
+        sources: list[str] | None = None,
+        top_k: int = 5,
+    ) -> list[RetrievedContext]:
+        """Retrieve context for several queries at once.
+
+        Each source receives all queries in one retrieve_batch call.
+
+        Args:
+            queries: Search queries
+            sources: List of source names to use (None = all)
+            top_k: Number of results per source
+
+        Returns:
+            One RetrievedContext per query, in query order
+        """
         if sources is None:
             sources = list(self.sources.keys())
 
-        all_chunks: list[RetrievedChunk] = []
+        all_chunks: list[list[RetrievedChunk]] = [[] for _ in queries]
 
         for source_name in sources:
             source = self.sources.get(source_name)
             if source:
-                chunks = source.retrieve(query, top_k)
-                all_chunks.extend(chunks)
-
-        # Merge and re-rank (simple score-based)
-        all_chunks.sort(key=lambda x: -x.score)
-
-        return RetrievedContext(query=query, chunks=all_chunks[:top_k * len(sources)], total_chunks=len(all_chunks))
+                for merged, chunks in zip(all_chunks, source.retrieve_batch(queries, top_k)):
+                    merged.extend(chunks)
+
+        # Merge and re-rank (simple score-based); ties keep source order
+        limit = top_k * len(sources)
+        return [
+            RetrievedContext(
+                query=query,
+                chunks=nlargest(limit, chunks, key=attrgetter("score")),
+                total_chunks=len(chunks),
+            )
+            for query, chunks in zip(queries, all_chunks)
+        ]
 
     def augment_prompt(self, query: str, prompt: str, max_context: int = 2000) -> str:
         """Augment a prompt with retrieved context.
@@ -238,8 +320,35 @@ class KnowledgeAugmentation:
         Returns:
             Augmented prompt
         """
-        context = self.retrieve(query)
+        return self._augment(prompt, self.retrieve(query), max_context)
+
+    def augment_prompts(
+        self,
+        queries: list[str],
+        prompts: list[str],
+        max_context: int = 2000,
+    ) -> list[str]:
+        """Augment several prompts, retrieving context for all queries at once.
+
+        Args:
+            queries: Original queries
+            prompts: Original prompts, one per query
+            max_context: Max context characters per prompt
+
+        Returns:
+            Augmented prompts, in input order
+        """
+        if len(queries) != len(prompts):
+            raise ValueError("queries and prompts must have the same length")
+
+        contexts = self.retrieve_batch(queries)
+        return [
+            self._augment(prompt, context, max_context)
+            for prompt, context in zip(prompts, contexts)
+        ]
 
+    def _augment(self, prompt: str, context: RetrievedContext, max_context: int) -> str:
+        """Append retrieved context to a prompt, truncating if too long."""
         if not context.chunks:
             return prompt
 
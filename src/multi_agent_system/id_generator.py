@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import itertools
+import os
+import threading
 import uuid
 import time
 from typing import Any
@@ -17,6 +20,73 @@ def generate_short_id(length: int = 8) -> str:
     return uuid.uuid4().hex[:length]
 
 
+class _HexIdPool:
+    """Hands out random hex IDs sliced from a shared entropy buffer.
+
+    One os.urandom call is amortized over many IDs instead of one per uuid4.
+    """
+
+    def __init__(self, buffer_size: int = 4096) -> None:
+        self._buffer_size = buffer_size
+        self._buf = b""
+        self._pos = 0
+        self._lock = threading.Lock()
+
+    def next(self, nbytes: int) -> str:
+        with self._lock:
+            if self._pos + nbytes > len(self._buf):
+                self._buf = os.urandom(max(self._buffer_size, nbytes))
+                self._pos = 0
+            start = self._pos
+            self._pos += nbytes
+            buf = self._buf
+        return buf[start:start + nbytes].hex()
+
+    def reset(self) -> None:
+        """Discard buffered entropy (e.g. in a forked child)."""
+        self._buf = b""
+        self._pos = 0
+        self._lock = threading.Lock()
+
+
+class _SequentialIds:
+    """Random per-process prefix followed by a monotonic counter."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def next(self) -> str:
+        return f"{self._prefix}{next(self._seq):08x}"
+
+    def reset(self) -> None:
+        """Pick a new prefix and restart the counter (e.g. in a forked child)."""
+        self._prefix = os.urandom(4).hex()
+        self._seq = itertools.count()
+
+
+_hex_id_pool = _HexIdPool()
+_sequential_ids = _SequentialIds()
+
+
+def _reset_after_fork() -> None:
+    _hex_id_pool.reset()
+    _sequential_ids.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def generate_hex_id(nbytes: int = 4) -> str:
+    """Generate random hex ID of 2 * nbytes characters from pooled entropy."""
+    return _hex_id_pool.next(nbytes)
+
+
+def generate_sequential_id() -> str:
+    """Generate unique, sortable 16-char hex ID without reading entropy."""
+    return _sequential_ids.next()
+
+
 def generate_timestamp_id() -> str:
     """Generate timestamp-based ID."""
     return f"{int(time.time() * 1000)}"
@@ -0,0 +1,55 @@
+"""JSON utilities, using orjson when installed."""
+
+from __future__ import annotations
+
+import json
+from datetime import date, time
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, fall back to stdlib json
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode values orjson supports natively the same way for stdlib json."""
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, non_str_keys: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, keeping non-ASCII text as is.
+
+    Output is the same with or without orjson.
+
+    Args:
+        obj: Value to serialize
+        indent: Indent by two spaces instead of writing compact JSON
+        non_str_keys: Allow dict keys that are not strings, such as ints
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if non_str_keys:
+            option |= orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, option=option)
+
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, default=_default)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+    return text.encode("utf-8")
@@ -0,0 +1,60 @@
+"""Unit tests for error recovery."""
+
+import unittest
+
+from multi_agent_system.enterprise.error_recovery import (
+    ErrorCategory,
+    ErrorClassifier,
+    ErrorSeverity,
+)
+
+
+class InternalErrorClassifier(ErrorClassifier):
+    """Classifier with its own pattern table."""
+
+    PATTERNS = {ErrorCategory.INTERNAL: ["assertion", "timeout"]}
+
+
+class TestErrorClassifier(unittest.TestCase):
+    """Test cases for ErrorClassifier."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.classifier = ErrorClassifier()
+
+    def test_default_patterns(self):
+        """Messages are matched against the default pattern table."""
+        self.assertEqual(
+            self.classifier.classify(TimeoutError("Request timed out")),
+            (ErrorCategory.TIMEOUT, ErrorSeverity.ERROR),
+        )
+        self.assertEqual(
+            self.classifier.classify("FATAL: connection refused"),
+            (ErrorCategory.NETWORK, ErrorSeverity.CRITICAL),
+        )
+
+    def test_subclass_patterns_are_used(self):
+        """A subclass overriding PATTERNS is not answered from another classifier's cache."""
+        self.classifier.classify("timeout while waiting")
+
+        self.assertEqual(
+            InternalErrorClassifier().classify("timeout while waiting"),
+            (ErrorCategory.INTERNAL, ErrorSeverity.ERROR),
+        )
+        self.assertEqual(
+            self.classifier.classify("timeout while waiting"),
+            (ErrorCategory.TIMEOUT, ErrorSeverity.ERROR),
+        )
+
+    def test_instance_patterns_replace_cached_results(self):
+        """Replacing PATTERNS on an instance takes effect for messages seen before."""
+        self.assertEqual(self.classifier.classify("disk quota hit")[0], ErrorCategory.RESOURCE)
+
+        self.classifier.PATTERNS = {ErrorCategory.INTERNAL: ["disk"]}
+
+        self.assertEqual(self.classifier.classify("disk quota hit")[0], ErrorCategory.INTERNAL)
+        self.assertEqual(ErrorClassifier().classify("disk quota hit")[0], ErrorCategory.RESOURCE)
+
+
+if __name__ == "__main__":
+    unittest.main()
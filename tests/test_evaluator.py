@@ -0,0 +1,114 @@
+"""Unit tests for the evaluation system."""
+
+import gc
+import tempfile
+import unittest
+
+from multi_agent_system.enterprise import evaluator
+from multi_agent_system.enterprise.evaluator import (
+    Conversation,
+    EvaluationMetrics,
+    EvaluationSystem,
+)
+
+
+class TestConversationContext(unittest.TestCase):
+    """Test cases for Conversation.get_context."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.conversation = Conversation(conversation_id="c1")
+        for i, role in enumerate(["user", "assistant", "user", "tool"]):
+            self.conversation.add_turn(role, f"turn {i}")
+
+    def test_recent_turns_only(self):
+        """Only the last max_turns turns are included, oldest first."""
+        self.assertEqual(
+            self.conversation.get_context(max_turns=2),
+            "User: turn 2\nAssistant: turn 3",
+        )
+
+    def test_zero_max_turns_keeps_all_turns(self):
+        """max_turns=0 returns the whole conversation."""
+        self.assertEqual(
+            self.conversation.get_context(max_turns=0),
+            "User: turn 0\nAssistant: turn 1\nUser: turn 2\nAssistant: turn 3",
+        )
+
+    def test_max_turns_above_length(self):
+        """Asking for more turns than exist returns them all."""
+        self.assertEqual(self.conversation.get_context(), self.conversation.get_context(max_turns=0))
+
+
+class TestEvaluationMetrics(unittest.TestCase):
+    """Test cases for EvaluationMetrics serialization."""
+
+    def test_round_trip_ignores_derived_average(self):
+        """Metrics written by to_dict load back, skipping the derived average."""
+        metrics = EvaluationMetrics(relevance=0.5, accuracy=0.25, safety=0.75, response_time_ms=12.0)
+
+        data = metrics.to_dict()
+
+        self.assertIn("average", data)
+        self.assertEqual(EvaluationMetrics.from_dict(data), metrics)
+
+    def test_missing_fields_use_defaults(self):
+        """Fields absent from the saved data fall back to their defaults."""
+        self.assertEqual(EvaluationMetrics.from_dict({"relevance": 1.0}), EvaluationMetrics(relevance=1.0))
+
+
+class TestEvaluationIndex(unittest.TestCase):
+    """Test cases for the batched evaluation index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = self._tmp.name
+
+    def test_close_writes_pending_index(self):
+        """Evaluations saved before close are listed in the index on reload."""
+        system = EvaluationSystem(self.path)
+        result = system.evaluate("what is rag", "RAG augments generation with retrieval.")
+        system.close()
+
+        reloaded = EvaluationSystem(self.path)
+        self.addCleanup(reloaded.close)
+        self.assertEqual([e.id for e in reloaded.evaluations], [result.id])
+
+    def test_exit_flush_writes_open_systems(self):
+        """The shared exit hook flushes systems that were never closed."""
+        system = EvaluationSystem(self.path)
+        self.addCleanup(system.close)
+        result = system.evaluate("q", "a.")
+
+        evaluator._flush_open_systems()
+
+        self.assertEqual([e.id for e in EvaluationSystem(self.path).evaluations], [result.id])
+
+    def test_exit_flush_does_not_keep_systems_alive(self):
+        """Dropped systems are released instead of being held until exit."""
+        before = len(evaluator._open_systems)
+        system = EvaluationSystem(self.path)
+        self.assertEqual(len(evaluator._open_systems), before + 1)
+
+        del system
+        gc.collect()
+
+        self.assertEqual(len(evaluator._open_systems), before)
+
+    def test_dropped_system_writes_pending_index(self):
+        """A system dropped without close still lists its evaluations in the index."""
+        system = EvaluationSystem(self.path)
+        result = system.evaluate("q", "a.")
+
+        del system
+        gc.collect()
+
+        reloaded = EvaluationSystem(self.path)
+        self.addCleanup(reloaded.close)
+        self.assertEqual([e.id for e in reloaded.evaluations], [result.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
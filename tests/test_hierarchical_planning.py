@@ -0,0 +1,77 @@
+"""Unit tests for hierarchical planning."""
+
+import unittest
+
+from multi_agent_system.enterprise.hierarchical_planning import (
+    HierarchicalPlanner,
+    PlanStatus,
+)
+
+
+class TestHierarchicalPlannerScheduling(unittest.TestCase):
+    """Test cases for dependency scheduling in HierarchicalPlanner."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.planner = HierarchicalPlanner()
+        self.plan = self.planner.create_plan("release")
+        self.a = self.planner.add_task(self.plan.id, "a")
+        self.b = self.planner.add_task(self.plan.id, "b", depends_on=[self.a.id])
+
+    def executable_names(self):
+        return [task.name for task in self.planner.get_executable_tasks(self.plan.id)]
+
+    def test_dependent_waits_for_dependency(self):
+        """Only tasks whose dependencies are completed are executable."""
+        self.assertEqual(self.executable_names(), ["a"])
+        self.assertEqual(self.planner.update_progress(self.plan.id), 0.0)
+
+    def test_mark_completed_releases_dependents(self):
+        """Completing a task through the planner releases its dependents."""
+        self.assertTrue(self.planner.mark_completed(self.a.id, result="ok"))
+
+        self.assertEqual(self.executable_names(), ["b"])
+        self.assertEqual(self.planner.update_progress(self.plan.id), 0.5)
+        self.assertEqual(self.a.result, "ok")
+
+    def test_direct_status_change_needs_resync(self):
+        """Statuses set directly on tasks are picked up by resync."""
+        self.executable_names()
+        self.a.status = PlanStatus.COMPLETED
+        self.assertEqual(self.executable_names(), ["a"])
+
+        self.assertTrue(self.planner.resync(self.plan.id))
+        self.assertEqual(self.executable_names(), ["b"])
+        self.assertEqual(self.planner.update_progress(self.plan.id), 0.5)
+
+        self.b.status = PlanStatus.IN_PROGRESS
+        self.planner.resync(self.plan.id)
+        self.assertEqual(self.executable_names(), [])
+        self.assertFalse(self.planner.resync("missing"))
+
+    def test_reopening_task_blocks_dependents(self):
+        """Moving a task away from COMPLETED makes its dependents wait again."""
+        self.planner.mark_completed(self.a.id)
+        self.assertEqual(self.executable_names(), ["b"])
+
+        self.planner.set_task_status(self.a.id, PlanStatus.FAILED)
+
+        self.assertEqual(self.executable_names(), [])
+        self.assertEqual(self.planner.update_progress(self.plan.id), 0.0)
+
+        self.planner.set_task_status(self.a.id, PlanStatus.PENDING)
+        self.assertEqual(self.executable_names(), ["a"])
+
+    def test_dependencies_outside_plan_block_task(self):
+        """Unknown dependencies and tasks of other plans never count as met."""
+        other = self.planner.create_plan("other")
+        foreign = self.planner.add_task(other.id, "foreign")
+        self.planner.mark_completed(foreign.id)
+        self.planner.add_task(self.plan.id, "c", depends_on=[foreign.id])
+        self.planner.add_task(self.plan.id, "d", depends_on=["missing"])
+
+        self.assertEqual(self.executable_names(), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Unit tests for JSON utilities."""
+
+import json
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from multi_agent_system import json_utils
+
+
+class TestJsonUtils(unittest.TestCase):
+    """Test cases for dumps and loads with and without orjson."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.data = {
+            "id": "abc",
+            "metadata": {"seen": datetime(2024, 1, 2, 3, 4, 5, 6), "name": "Zoë", 1: 0.1},
+        }
+        self.expected = {
+            "id": "abc",
+            "metadata": {"seen": "2024-01-02T03:04:05.000006", "name": "Zoë", "1": 0.1},
+        }
+
+    def fallback_dumps(self, *args, **kwargs):
+        with mock.patch.object(json_utils, "orjson", None):
+            return json_utils.dumps(*args, **kwargs)
+
+    def test_compact_output(self):
+        """Default output is compact UTF-8 JSON."""
+        data = self.fallback_dumps(self.data, non_str_keys=True)
+
+        self.assertNotIn(b" ", data)
+        self.assertIn("Zoë".encode("utf-8"), data)
+        self.assertEqual(json_utils.loads(data), self.expected)
+
+    def test_indented_output(self):
+        """indent=True writes two-space indented JSON."""
+        data = self.fallback_dumps(self.data, indent=True, non_str_keys=True)
+
+        self.assertTrue(data.startswith(b'{\n  "id": "abc"'))
+        self.assertEqual(json.loads(data), self.expected)
+
+    def test_fallback_matches_orjson(self):
+        """Both encoders produce identical bytes for each format."""
+        if json_utils.orjson is None:
+            self.skipTest("orjson is not installed")
+        for options in ({}, {"indent": True}):
+            with self.subTest(**options):
+                self.assertEqual(
+                    json_utils.dumps(self.data, non_str_keys=True, **options),
+                    self.fallback_dumps(self.data, non_str_keys=True, **options),
+                )
+
+    def test_unsupported_type_raises(self):
+        """Values neither encoder supports are rejected by the fallback too."""
+        with self.assertRaises(TypeError):
+            self.fallback_dumps({"value": object()})
+
+    def test_loads_accepts_text_and_bytes(self):
+        """loads parses both str and bytes input."""
+        with mock.patch.object(json_utils, "orjson", None):
+            self.assertEqual(json_utils.loads('{"a": [1]}'), {"a": [1]})
+            self.assertEqual(json_utils.loads(b'{"a": [1]}'), {"a": [1]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Unit tests for the memory system."""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from multi_agent_system.enterprise import memory
+from multi_agent_system.enterprise.memory import LongTermMemory
+
+
+class TestLongTermMemoryLog(unittest.TestCase):
+    """Test cases for the append-only log of LongTermMemory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = self._tmp.name
+        self.log_file = Path(self.path) / "entries.jsonl"
+
+    def test_entries_survive_reload(self):
+        """Stored and updated entries are read back from the log."""
+        memory = LongTermMemory(self.path)
+        entry_id = memory.store("likes tea", importance=0.5, metadata={"topic": "drinks"})
+        memory.update_user_profile("u1", {"lang": "en"})
+        memory.update_user_profile("u1", {"tz": "UTC"})
+
+        reloaded = LongTermMemory(self.path)
+
+        self.assertEqual(len(reloaded), 2)
+        self.assertEqual(reloaded.retrieve("tea")[0].id, entry_id)
+        self.assertEqual(reloaded.get_user_profile("u1"), {"user_id": "u1", "lang": "en", "tz": "UTC"})
+        self.assertEqual(len(self.log_file.read_bytes().splitlines()), 3)
+
+    def test_log_is_compacted_when_mostly_stale(self):
+        """Repeated updates of one entry rewrite the log with live entries only."""
+        memory = LongTermMemory(self.path)
+        memory.store("keep me")
+        for i in range(LongTermMemory.COMPACT_MIN_LINES):
+            memory.update_user_profile("u1", {"visits": i})
+
+        lines = self.log_file.read_bytes().splitlines()
+        self.assertLess(len(lines), LongTermMemory.COMPACT_MIN_LINES)
+
+        reloaded = LongTermMemory(self.path)
+        self.assertEqual(len(reloaded), 2)
+        self.assertEqual(
+            reloaded.get_user_profile("u1")["visits"],
+            LongTermMemory.COMPACT_MIN_LINES - 1,
+        )
+
+    def test_torn_last_line_is_dropped(self):
+        """A partially written final line is skipped and removed from the log."""
+        memory = LongTermMemory(self.path)
+        memory.store("first")
+        with open(self.log_file, "ab") as f:
+            f.write(b'{"id": "torn", "cont')
+
+        reloaded = LongTermMemory(self.path)
+        self.assertEqual([m.content for m in reloaded.retrieve()], ["first"])
+
+        reloaded.store("second")
+        again = LongTermMemory(self.path)
+        self.assertEqual(sorted(m.content for m in again.retrieve()), ["first", "second"])
+
+    def test_final_line_without_newline_is_kept(self):
+        """A complete final entry missing its newline is kept and terminated."""
+        memory = LongTermMemory(self.path)
+        memory.store("first")
+        self.log_file.write_bytes(self.log_file.read_bytes().rstrip(b"\n"))
+
+        reloaded = LongTermMemory(self.path)
+        reloaded.store("second")
+
+        again = LongTermMemory(self.path)
+        self.assertEqual(sorted(m.content for m in again.retrieve()), ["first", "second"])
+
+    def test_corrupt_line_before_end_raises(self):
+        """Damage before the end of the log is not silently discarded."""
+        memory = LongTermMemory(self.path)
+        memory.store("first")
+        memory.store("second")
+        lines = self.log_file.read_bytes().splitlines(keepends=True)
+        self.log_file.write_bytes(b"{broken\n" + lines[1])
+
+        with self.assertRaises(ValueError):
+            LongTermMemory(self.path)
+
+
+class TestLongTermMemoryEmbeddings(unittest.TestCase):
+    """Test cases for embeddings stored outside the log."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = self._tmp.name
+        self.memory = LongTermMemory(self.path)
+        self.entry_id = self.memory.store("vector", embedding=[0.5, 0.25])
+        self.memory.store("plain")
+
+    def embedding_files(self):
+        return sorted(path.name for path in Path(self.path).glob("embeddings*.f32"))
+
+    def test_stored_entry_keeps_embedding(self):
+        """Writing the embedding to disk does not clear it on the entry."""
+        entry = self.memory.retrieve("vector")[0]
+
+        self.assertEqual(entry.embedding, [0.5, 0.25])
+        self.assertEqual(self.memory.get_embedding(self.entry_id), [0.5, 0.25])
+        self.assertNotIn("0.25", (Path(self.path) / "entries.jsonl").read_text())
+
+    def test_embedding_loaded_lazily_after_reload(self):
+        """Reloaded entries read their embedding from the embeddings file on demand."""
+        reloaded = LongTermMemory(self.path)
+
+        self.assertIsNone(reloaded.retrieve("vector")[0].embedding)
+        self.assertEqual(reloaded.get_embedding(self.entry_id), [0.5, 0.25])
+        self.assertEqual(reloaded.retrieve_semantic([1.0, 0.5], limit=1)[0].id, self.entry_id)
+
+    def test_compaction_switches_embeddings_file(self):
+        """Compaction moves embeddings to a new file named in the log."""
+        LongTermMemory(self.path)._save_index()
+
+        files = self.embedding_files()
+        self.assertEqual(len(files), 1)
+        self.assertNotEqual(files, ["embeddings.f32"])
+        self.assertEqual(LongTermMemory(self.path).get_embedding(self.entry_id), [0.5, 0.25])
+
+    def test_failed_compaction_keeps_previous_files(self):
+        """A compaction interrupted before the log is replaced leaves the old state usable."""
+        reloaded = LongTermMemory(self.path)
+        with mock.patch.object(memory.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                reloaded._save_index()
+
+        self.assertEqual(self.embedding_files(), ["embeddings.f32"])
+        self.assertEqual(reloaded.get_embedding(self.entry_id), [0.5, 0.25])
+        self.assertEqual(LongTermMemory(self.path).get_embedding(self.entry_id), [0.5, 0.25])
+
+    def test_orphaned_embeddings_file_is_removed(self):
+        """Embeddings files left by an interrupted compaction are cleaned up on load."""
+        (Path(self.path) / "embeddings-dead.f32").write_bytes(b"\0" * 8)
+
+        reloaded = LongTermMemory(self.path)
+
+        self.assertEqual(self.embedding_files(), ["embeddings.f32"])
+        self.assertEqual(reloaded.get_embedding(self.entry_id), [0.5, 0.25])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Unit tests for agent monitoring."""
+
+import tempfile
+import unittest
+
+from multi_agent_system.enterprise.monitoring import AgentMonitor, AgentStatus
+
+
+class TestAgentHealth(unittest.TestCase):
+    """Test cases for cached health checks in AgentMonitor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.monitor = AgentMonitor(self._tmp.name)
+        self.monitor.record_request("search", success=True, response_time_ms=120.0)
+
+    def test_repeated_checks_return_independent_results(self):
+        """Changing a returned health result does not affect later checks."""
+        first = self.monitor.check_health("search")
+        first.issues.append("edited by caller")
+        first.metrics["total_requests"] = 99
+        first.status = AgentStatus.UNKNOWN
+
+        second = self.monitor.check_health("search")
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.issues, [])
+        self.assertEqual(second.metrics["total_requests"], 1)
+        self.assertIsNot(second.status, AgentStatus.UNKNOWN)
+
+    def test_cached_result_gets_current_check_time(self):
+        """A reused health result carries the time of the new check."""
+        self.monitor.check_health("search")
+
+        health = self.monitor._check_health("search", "2030-01-01T00:00:00")
+
+        self.assertEqual(health.last_check, "2030-01-01T00:00:00")
+
+    def test_new_requests_refresh_health(self):
+        """Recording a request invalidates the cached result."""
+        self.monitor.check_health("search")
+        self.monitor.record_request("search", success=False, response_time_ms=80.0)
+
+        health = self.monitor.check_health("search")
+
+        self.assertEqual(health.metrics["total_requests"], 2)
+        self.assertEqual(health.metrics["error_rate"], 0.5)
+
+
+class TestSummary(unittest.TestCase):
+    """Test cases for AgentMonitor.get_summary totals."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.monitor = AgentMonitor(self._tmp.name)
+        self.monitor.record_request("search", True, 10.0, tokens=100, cost=0.5)
+        self.monitor.record_request("answer", False, 20.0, tokens=50, cost=0.25)
+
+    def totals(self):
+        summary = self.monitor.get_summary()
+        return summary["total_requests"], summary["total_tokens"], summary["total_cost"]
+
+    def test_totals_cover_all_agents(self):
+        """Totals add up the requests of every agent."""
+        self.assertEqual(self.totals(), (2, 150, 0.75))
+
+    def test_direct_metric_updates_are_counted(self):
+        """Requests recorded on an agent's metrics show up in the totals."""
+        self.monitor.get_agent_metrics("search").record(True, 5.0, tokens=10, cost=0.25)
+
+        self.assertEqual(self.totals(), (3, 160, 1.0))
+
+    def test_reset_updates_totals(self):
+        """Resetting one agent or all agents removes their share of the totals."""
+        self.monitor.reset_metrics("search")
+        self.assertEqual(self.totals(), (1, 50, 0.25))
+
+        self.monitor.reset_metrics()
+        self.assertEqual(self.totals(), (0, 0, 0.0))
+
+
+class TestEventLog(unittest.TestCase):
+    """Test cases for the bounded event log in AgentMonitor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def record(self, monitor, count):
+        for i in range(count):
+            monitor.record_request("search", success=True, response_time_ms=float(i))
+
+    def test_max_events_from_constructor(self):
+        """Only the newest max_events events are kept."""
+        monitor = AgentMonitor(self._tmp.name, max_events=3)
+        self.record(monitor, 5)
+
+        self.assertEqual(monitor.max_events, 3)
+        self.assertEqual([e.data["response_time_ms"] for e in monitor.events], [2.0, 3.0, 4.0])
+
+    def test_changing_max_events_resizes_log(self):
+        """Assigning max_events bounds the log, keeping the newest events."""
+        monitor = AgentMonitor(self._tmp.name)
+        self.record(monitor, 5)
+
+        monitor.max_events = 2
+        self.assertEqual([e.data["response_time_ms"] for e in monitor.events], [3.0, 4.0])
+
+        monitor.max_events = 4
+        self.record(monitor, 3)
+        self.assertEqual(len(monitor.events), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Unit tests for multi-agent message routing."""
+
+import asyncio
+import unittest
+import warnings
+
+from multi_agent_system.enterprise.multi_agent_comm import (
+    AgentCommunication,
+    Message,
+    MessagePriority,
+    MessageRouter,
+    MessageStatus,
+    MessageType,
+)
+
+
+class TestMessageRouterDispatch(unittest.TestCase):
+    """Test cases for MessageRouter.dispatch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.router = MessageRouter()
+        self.message = Message(msg_type=MessageType.QUERY, content="hello")
+
+    def dispatch(self):
+        return asyncio.run(self.router.dispatch(self.message))
+
+    def test_results_keep_registration_order(self):
+        """Results are reported per handler in registration order."""
+        async def slow(message):
+            await asyncio.sleep(0.01)
+            return "slow"
+
+        async def fast(message):
+            return message.content
+
+        self.router.register_handler(MessageType.QUERY, slow)
+        self.router.register_handler(MessageType.QUERY, fast)
+
+        result = self.dispatch()
+
+        self.assertEqual(result["dispatched"], 2)
+        self.assertEqual(
+            result["results"],
+            [{"handler": "slow", "result": "slow"}, {"handler": "fast", "result": "hello"}],
+        )
+
+    def test_failing_handlers_are_reported_per_handler(self):
+        """Sync raises, non-awaitable returns and async errors do not fail dispatch."""
+        async def ok(message):
+            return "ok"
+
+        def bad_sync(message):
+            raise ValueError("boom")
+
+        def not_awaitable(message):
+            return 42
+
+        async def bad_async(message):
+            raise RuntimeError("async boom")
+
+        for handler in (ok, bad_sync, not_awaitable, bad_async):
+            self.router.register_handler(MessageType.QUERY, handler)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            result = self.dispatch()
+
+        results = result["results"]
+        self.assertEqual(result["dispatched"], 4)
+        self.assertEqual(results[0], {"handler": "ok", "result": "ok"})
+        self.assertEqual(results[1], {"handler": "bad_sync", "error": "boom"})
+        self.assertEqual(results[2]["handler"], "not_awaitable")
+        self.assertIn("error", results[2])
+        self.assertEqual(results[3], {"handler": "bad_async", "error": "async boom"})
+
+    def test_no_handlers(self):
+        """Dispatch without handlers reports nothing."""
+        self.assertEqual(self.dispatch(), {"dispatched": 0, "results": []})
+
+
+class TestAgentCommunicationStatistics(unittest.TestCase):
+    """Test cases for message status and pending-message tallies."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.comm = AgentCommunication()
+        self.comm.register_agent("a")
+        self.comm.register_agent("b")
+
+    def test_statistics_report_plain_values(self):
+        """Tallies are keyed by the enum values, as before they were kept by member."""
+        self.comm.send_message("a", "b", "hi", priority=MessagePriority.HIGH)
+        self.comm.send_message("a", "b", "fyi", msg_type=MessageType.NOTIFICATION)
+
+        stats = self.comm.get_statistics()
+
+        self.assertEqual(stats["by_type"], {"request": 1, "notification": 1})
+        self.assertEqual(stats["by_priority"], {3: 1, 2: 1})
+
+    def test_sent_message_status(self):
+        """Sent messages are marked SENT and serialize the status value."""
+        message = self.comm.send_message("a", "b", "hi")
+
+        self.assertIs(message.status, MessageStatus.SENT)
+        self.assertEqual(message.to_dict()["status"], "sent")
+        self.assertNotEqual(message.status, "sent")
+
+    def test_enums_do_not_equal_plain_values(self):
+        """Message enums compare by member only and serialize their values."""
+        message = self.comm.send_message("a", "b", "hi")
+
+        self.assertNotEqual(message.msg_type, "request")
+        self.assertNotEqual(message.priority, 2)
+        self.assertEqual(message.to_dict()["type"], "request")
+        self.assertEqual(message.to_dict()["priority"], 2)
+
+    def test_evicted_messages_leave_sender_lists(self):
+        """Messages evicted past max_pending are dropped from per-agent lists and tallies."""
+        self.comm.max_pending = 2
+        first = self.comm.send_message("a", "b", "one")
+        second = self.comm.send_message("b", "a", "two")
+        third = self.comm.send_message("a", "b", "three", msg_type=MessageType.NOTIFICATION)
+
+        self.assertEqual(self.comm.get_agent_messages("a"), [third])
+        self.assertEqual(self.comm.get_agent_messages("b"), [second])
+        self.assertNotIn(first, self.comm.get_agent_messages("a"))
+
+        self.comm.send_message("a", "b", "four")
+        self.assertEqual(self.comm.get_agent_messages("b"), [])
+        self.assertNotIn("b", self.comm._by_agent)
+        self.assertEqual(self.comm.get_statistics()["by_type"], {"notification": 1, "request": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Unit tests for multi-agent negotiation."""
+
+import unittest
+
+from multi_agent_system.enterprise.negotiation import (
+    CONVERGENCE_PATIENCE,
+    NegotiationManager,
+    NegotiationState,
+    Offer,
+)
+
+
+class TestNegotiationConvergence(unittest.TestCase):
+    """Test cases for early impasse detection in NegotiationManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.manager = NegotiationManager()
+        self.negotiation = self.manager.create_negotiation("price", ["buyer", "seller"])
+
+    def submit(self, agent_id, **kwargs):
+        return self.manager.submit_offer(self.negotiation.id, agent_id, agent_id, Offer(**kwargs))
+
+    def test_terms_only_offers_do_not_stall(self):
+        """Offers without a value never count as converged."""
+        for agent_id, price in (("buyer", 100), ("seller", 60), ("buyer", 90)):
+            self.assertTrue(self.submit(agent_id, terms={"price": price}))
+
+        self.assertEqual(self.negotiation.state, NegotiationState.COUNTERING)
+        self.assertEqual(self.negotiation.outcome, "")
+
+    def test_parties_converging_on_same_value_are_not_failed(self):
+        """Different agents offering the same value is progress, not an impasse."""
+        for agent_id, value in (("buyer", 60.0), ("seller", 100.0), ("buyer", 80.0), ("seller", 80.0)):
+            self.submit(agent_id, value=value)
+
+        self.assertNotEqual(self.negotiation.state, NegotiationState.FAILED)
+
+    def test_agent_repeating_its_offer_reaches_impasse(self):
+        """An agent that keeps repeating its own offer stalls the negotiation."""
+        self.submit("seller", value=100.0)
+        for _ in range(CONVERGENCE_PATIENCE):
+            self.submit("seller", value=100.0)
+
+        self.assertEqual(self.negotiation.state, NegotiationState.FAILED)
+        self.assertEqual(self.negotiation.outcome, "impasse")
+        self.assertEqual(self.manager.get_statistics()["impasses"], 1)
+
+    def test_failed_negotiation_rejects_offers_and_responses(self):
+        """No offers or responses are accepted once a negotiation has failed."""
+        for _ in range(CONVERGENCE_PATIENCE + 1):
+            self.submit("seller", value=100.0)
+
+        self.assertFalse(self.submit("buyer", value=90.0))
+        self.assertFalse(self.manager.respond_to_offer(self.negotiation.id, "buyer", accept=True))
+        self.assertEqual(self.negotiation.outcome, "impasse")
+        self.assertIsNone(self.negotiation.agreement)
+
+
+if __name__ == "__main__":
+    unittest.main()
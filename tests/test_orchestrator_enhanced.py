@@ -0,0 +1,200 @@
+"""Unit tests for the enhanced orchestrator."""
+
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from multi_agent_system.core.agent import AgentResponse, BaseAgent
+from multi_agent_system.core.message import Message
+from multi_agent_system.enterprise import orchestrator_enhanced
+from multi_agent_system.enterprise.orchestrator_enhanced import (
+    EnhancedOrchestrator,
+    ExecutionConfig,
+    ExecutionStrategy,
+)
+
+
+class StubAgent(BaseAgent):
+    """Agent answering with a fixed decision, optionally after a delay."""
+
+    def __init__(self, name, decision="yes", release=None, error=None):
+        self.name = name
+        self.decision = decision
+        self.release = release
+        self.error = error
+
+    def handle(self, message):
+        if self.release is not None:
+            self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return AgentResponse(agent=self.name, success=True, data=self.decision)
+
+
+class TestConsensusExecution(unittest.TestCase):
+    """Test cases for EnhancedOrchestrator consensus execution."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # Keep the global memory and evaluation stores off the disk
+        for getter in ("get_memory_system", "get_evaluation_system"):
+            patcher = mock.patch.object(orchestrator_enhanced, getter)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.release = threading.Event()
+        self.message = Message(task_type="question", content={})
+
+    def run_consensus(self, agents):
+        orchestrator = EnhancedOrchestrator(agents, ExecutionConfig(timeout_seconds=1))
+        self.addCleanup(orchestrator.close)
+        # Runs before close so slow agents do not hold up the pool shutdown
+        self.addCleanup(self.release.set)
+        plan = SimpleNamespace(steps=[SimpleNamespace(agent_type=agent.name) for agent in agents])
+        return orchestrator._execute_consensus(self.message, plan)
+
+    def test_opinions_keep_step_order(self):
+        """All agent decisions are collected in plan step order."""
+        response = self.run_consensus([StubAgent("a", "x"), StubAgent("b", "y"), StubAgent("c", "x")])
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.data["failed_agents"], [])
+        self.assertEqual(
+            response.data["all_opinions"],
+            [{"agent": "a", "decision": "x"}, {"agent": "b", "decision": "y"}, {"agent": "c", "decision": "x"}],
+        )
+
+    def test_timeout_is_shared_by_all_agents(self):
+        """Slow agents together wait at most one timeout, not one each."""
+        agents = [StubAgent("fast"), StubAgent("slow1", release=self.release), StubAgent("slow2", release=self.release)]
+
+        start = time.monotonic()
+        response = self.run_consensus(agents)
+
+        self.assertLess(time.monotonic() - start, 1.9)
+        self.assertEqual([o["agent"] for o in response.data["all_opinions"]], ["fast"])
+        self.assertEqual(
+            response.data["failed_agents"],
+            [{"agent": "slow1", "error": "timed out"}, {"agent": "slow2", "error": "timed out"}],
+        )
+
+    def test_failed_agents_are_reported(self):
+        """Agents that raise are listed with their error instead of being dropped silently."""
+        response = self.run_consensus([StubAgent("ok"), StubAgent("broken", error=ValueError("bad input"))])
+
+        self.assertEqual([o["agent"] for o in response.data["all_opinions"]], ["ok"])
+        self.assertEqual(response.data["failed_agents"], [{"agent": "broken", "error": "bad input"}])
+
+
+class AsyncStubAgent(StubAgent):
+    """Stub agent with its own async handler."""
+
+    async def ahandle(self, message):
+        if self.error is not None:
+            raise self.error
+        return AgentResponse(agent=self.name, success=True, data=self.decision)
+
+
+class TestAsyncDispatch(unittest.TestCase):
+    """Test cases for EnhancedOrchestrator.adispatch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        for getter in ("get_memory_system", "get_evaluation_system"):
+            patcher = mock.patch.object(orchestrator_enhanced, getter)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.message = Message(task_type="question", content={"query": "q"})
+
+    def make_orchestrator(self, agents):
+        orchestrator = EnhancedOrchestrator(
+            agents, ExecutionConfig(strategy=ExecutionStrategy.PARALLEL, enable_memory=False)
+        )
+        self.addCleanup(orchestrator.close)
+        steps = [
+            SimpleNamespace(step_id=f"s{i}", agent_type=agent.name)
+            for i, agent in enumerate(agents)
+        ]
+        orchestrator.planner = mock.Mock()
+        orchestrator.planner.plan.return_value = SimpleNamespace(steps=steps)
+        return orchestrator
+
+    def test_parallel_results_keep_step_order(self):
+        """Sync and async agents are awaited together and combined in step order."""
+        orchestrator = self.make_orchestrator([StubAgent("a", "x"), AsyncStubAgent("b", "y")])
+
+        response = asyncio.run(orchestrator.adispatch(self.message))
+
+        self.assertTrue(response.success)
+        self.assertEqual(
+            [(step["step_id"], step["data"]) for step in response.data["steps"]],
+            [("s0", "x"), ("s1", "y")],
+        )
+        self.assertEqual(response.data["final_result"], "y")
+
+    def test_failing_steps_are_dropped(self):
+        """A step that raises is left out instead of failing the dispatch."""
+        orchestrator = self.make_orchestrator([
+            StubAgent("a", "x"),
+            AsyncStubAgent("b", error=ValueError("bad input")),
+            StubAgent("c", error=RuntimeError("down")),
+        ])
+
+        response = asyncio.run(orchestrator.adispatch(self.message))
+
+        self.assertTrue(response.success)
+        self.assertEqual([step["step_id"] for step in response.data["steps"]], ["s0"])
+        self.assertEqual(response.data["final_result"], "x")
+
+    def test_planning_and_bookkeeping_run_off_the_loop(self):
+        """Planning and response bookkeeping run in worker threads."""
+        orchestrator = self.make_orchestrator([StubAgent("a")])
+        threads = []
+        for name in ("_prepare", "_finish"):
+            original = getattr(orchestrator, name)
+
+            def record(*args, _original=original):
+                threads.append(threading.current_thread())
+                return _original(*args)
+
+            setattr(orchestrator, name, record)
+
+        asyncio.run(orchestrator.adispatch(self.message))
+
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_planning_errors_become_error_response(self):
+        """Exceptions raised while planning are returned as a failed response."""
+        orchestrator = self.make_orchestrator([StubAgent("a")])
+        orchestrator.planner.plan.side_effect = RuntimeError("planner down")
+
+        response = asyncio.run(orchestrator.adispatch(self.message))
+
+        self.assertFalse(response.success)
+        self.assertIn("planner down", response.error)
+
+
+class TestOrchestratorLifecycle(unittest.TestCase):
+    """Test cases for EnhancedOrchestrator worker pool ownership."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        for getter in ("get_memory_system", "get_evaluation_system"):
+            patcher = mock.patch.object(orchestrator_enhanced, getter)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_context_manager_closes_pool(self):
+        """Leaving the with-block shuts the worker pool down."""
+        with EnhancedOrchestrator([]) as orchestrator:
+            orchestrator._pool.submit(int).result()
+
+        with self.assertRaises(RuntimeError):
+            orchestrator._pool.submit(int)
+
+
+if __name__ == "__main__":
+    unittest.main()
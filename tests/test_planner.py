@@ -0,0 +1,138 @@
+"""Unit tests for task planning."""
+
+import unittest
+
+from multi_agent_system.enterprise.planner import (
+    ExecutionPlan,
+    StepStatus,
+    TaskPlanner,
+    TaskStep,
+    TaskType,
+)
+
+
+class TestExecutionPlanScheduling(unittest.TestCase):
+    """Test cases for ExecutionPlan.get_ready_steps."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # a -> b, a -> c, (b, c) -> d
+        self.plan = ExecutionPlan(
+            plan_id="p1",
+            original_request="compare papers",
+            task_type=TaskType.ANALYSIS,
+            steps=[
+                TaskStep("a", "a", "", "search"),
+                TaskStep("b", "b", "", "extract", dependencies=["a"]),
+                TaskStep("c", "c", "", "extract", dependencies=["a"]),
+                TaskStep("d", "d", "", "match", dependencies=["b", "c"]),
+            ],
+        )
+
+    def ready_ids(self, completed=None):
+        return [step.step_id for step in self.plan.get_ready_steps(completed)]
+
+    def test_mark_completed_releases_dependents(self):
+        """Steps become ready once all of their dependencies are completed."""
+        self.assertEqual(self.ready_ids(), ["a"])
+
+        self.plan.mark_completed("a")
+        self.assertEqual(self.ready_ids(), ["b", "c"])
+
+        self.plan.mark_completed("b")
+        self.assertEqual(self.ready_ids(), ["c"])
+
+        self.plan.mark_completed("c")
+        self.assertEqual(self.ready_ids(), ["d"])
+
+        self.plan.mark_completed("d")
+        self.assertEqual(self.ready_ids(), [])
+        self.assertTrue(self.plan.is_complete())
+
+    def test_running_steps_are_not_ready(self):
+        """Released steps that already started are not returned again."""
+        self.plan.mark_completed("a")
+        self.plan.get_step("b").status = StepStatus.RUNNING
+
+        self.assertEqual(self.ready_ids(), ["c"])
+
+    def test_explicit_completed_set(self):
+        """Passing completed ids checks dependencies of pending steps against that set."""
+        self.assertEqual(self.ready_ids({"a", "b"}), ["a", "b", "c"])
+        self.assertEqual(self.ready_ids(set()), ["a"])
+
+    def test_direct_status_changes_need_resync(self):
+        """Completing or reopening a step by setting status applies after resync."""
+        self.assertEqual(self.ready_ids(), ["a"])
+
+        self.plan.get_step("a").status = StepStatus.COMPLETED
+        self.assertEqual(self.ready_ids(), [])
+
+        self.plan.resync()
+        self.assertEqual(self.ready_ids(), ["b", "c"])
+
+        self.plan.get_step("a").status = StepStatus.PENDING
+        self.plan.resync()
+        self.assertEqual(self.ready_ids(), ["a"])
+
+    def test_update_step_status_keeps_schedule_in_sync(self):
+        """Completing and reopening steps through the planner updates ready steps."""
+        planner = TaskPlanner()
+        planner.plans[self.plan.plan_id] = self.plan
+
+        self.assertTrue(planner.update_step_status("p1", "a", StepStatus.COMPLETED))
+        self.assertEqual(self.ready_ids(), ["b", "c"])
+
+        self.assertTrue(planner.update_step_status("p1", "a", StepStatus.PENDING))
+        self.assertEqual(self.ready_ids(), ["a"])
+        self.assertFalse(planner.update_step_status("p1", "missing", StepStatus.COMPLETED))
+
+    def test_steps_added_later_are_scheduled(self):
+        """Growing the plan after scheduling includes the new steps."""
+        self.plan.mark_completed("a")
+        self.ready_ids()
+        self.plan.steps.append(TaskStep("e", "e", "", "search", dependencies=["a"]))
+
+        self.assertEqual(self.ready_ids(), ["b", "c", "e"])
+
+
+class TestExecutionPlanGetStep(unittest.TestCase):
+    """Test cases for ExecutionPlan.get_step."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.plan = ExecutionPlan(
+            plan_id="p1",
+            original_request="find papers",
+            task_type=TaskType.INFORMATION_RETRIEVAL,
+            steps=[TaskStep("s1", "old", "", "search"), TaskStep("s2", "second", "", "search")],
+        )
+
+    def test_reassigned_steps_are_used(self):
+        """Reassigning steps to a list with the same ids returns the new steps."""
+        self.assertEqual(self.plan.get_step("s1").name, "old")
+
+        self.plan.steps = [TaskStep("s1", "new", "", "search"), TaskStep("s2", "second", "", "search")]
+
+        self.assertEqual(self.plan.get_step("s1").name, "new")
+
+    def test_replaced_and_appended_steps(self):
+        """Steps replaced in place or appended are found."""
+        self.plan.get_step("s1")
+        self.plan.steps[0] = TaskStep("s1", "replaced", "", "search")
+        self.plan.steps.append(TaskStep("s3", "third", "", "search"))
+
+        self.assertEqual(self.plan.get_step("s1").name, "replaced")
+        self.assertEqual(self.plan.get_step("s3").name, "third")
+        self.assertIsNone(self.plan.get_step("missing"))
+
+    def test_duplicate_ids_resolve_to_first_step(self):
+        """The first step with a duplicated id is returned."""
+        self.plan.steps = [TaskStep("s2", "first", "", "search"), TaskStep("s2", "second", "", "search")]
+
+        self.assertEqual(self.plan.get_step("s2").name, "first")
+        self.assertIsNone(self.plan.get_step("s1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Unit tests for the proactive layer."""
+
+import unittest
+
+from multi_agent_system.enterprise.proactive import (
+    MAX_RECENT_QUERIES,
+    ProactiveLayer,
+    UserContext,
+)
+
+
+class TestUserContext(unittest.TestCase):
+    """Test cases for recent query tracking in UserContext."""
+
+    def test_recent_queries_are_bounded(self):
+        """Only the newest MAX_RECENT_QUERIES queries are kept, oldest first."""
+        layer = ProactiveLayer()
+        for i in range(MAX_RECENT_QUERIES + 3):
+            layer.update_context("u", f"q{i}")
+
+        queries = layer.user_contexts["u"].get_recent_queries()
+
+        self.assertEqual(queries, [f"q{i}" for i in range(3, MAX_RECENT_QUERIES + 3)])
+        self.assertEqual(queries[-2:], [f"q{MAX_RECENT_QUERIES + 1}", f"q{MAX_RECENT_QUERIES + 2}"])
+
+    def test_list_argument_is_bounded(self):
+        """Queries passed to the constructor as a list get the same bound."""
+        ctx = UserContext(recent_queries=[f"q{i}" for i in range(MAX_RECENT_QUERIES + 1)])
+        ctx.recent_queries.append("new")
+
+        self.assertEqual(len(ctx.recent_queries), MAX_RECENT_QUERIES)
+        self.assertEqual(ctx.get_recent_queries()[0], "q2")
+        self.assertEqual(ctx.recent_queries[-1], "new")
+
+
+class TestPredictNeeds(unittest.TestCase):
+    """Test cases for batch and best-need prediction in ProactiveLayer."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.layer = ProactiveLayer()
+        # follow_up only
+        self.layer.update_context("follow", "what is rag")
+        self.layer.update_context("follow", "how does it rank")
+        # daily_brief only
+        self.layer.update_context("morning", "hello")
+        self.layer.user_contexts["morning"].time_context = "morning"
+        # follow_up, daily_brief and personalized_recommendations
+        self.layer.update_context("all", "first")
+        self.layer.update_context("all", "second")
+        self.layer.user_contexts["all"].time_context = "morning"
+        self.layer.user_contexts["all"].explicit_preferences["interested_topics"] = ["rag"]
+
+    def need_ids(self, predictions):
+        return [p.need_id for p in predictions]
+
+    def test_batch_matches_single_predictions(self):
+        """Batch results follow the order of user_ids and match predict_needs."""
+        user_ids = ["all", "follow", "morning", "follow"]
+
+        batch = self.layer.predict_needs_batch(user_ids)
+
+        self.assertEqual(
+            [self.need_ids(p) for p in batch],
+            [self.need_ids(self.layer.predict_needs(u)) for u in user_ids],
+        )
+        self.assertEqual(
+            self.need_ids(batch[0]),
+            ["follow_up", "daily_brief", "personalized_recommendations"],
+        )
+
+    def test_unknown_users(self):
+        """Unknown users get no predictions and no best need."""
+        self.assertEqual(self.layer.predict_needs_batch(["missing", "follow"])[0], [])
+        self.assertEqual(self.layer.predict_needs_batch([]), [])
+        self.assertIsNone(self.layer.predict_best("missing"))
+
+    def test_best_is_most_confident_prediction(self):
+        """predict_best returns the most confident of predict_needs."""
+        for user_id in ("all", "follow", "morning"):
+            with self.subTest(user_id=user_id):
+                expected = max(self.layer.predict_needs(user_id), key=lambda p: p.confidence)
+                self.assertEqual(self.layer.predict_best(user_id), expected)
+
+        self.assertEqual(self.layer.predict_best("all").need_id, "personalized_recommendations")
+
+    def test_user_with_no_triggered_patterns(self):
+        """A known user that triggers no pattern has no predictions."""
+        self.layer.update_context("quiet", "one query")
+
+        self.assertEqual(self.layer.predict_needs_batch(["quiet"]), [[]])
+        self.assertIsNone(self.layer.predict_best("quiet"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+"""Unit tests for procedural knowledge storage."""
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from multi_agent_system.enterprise.procedural_knowledge import (
+    ProceduralKnowledge,
+    Procedure,
+    ProcedureRegistry,
+    ProcedureStep,
+)
+
+
+class TestProcedureSteps(unittest.TestCase):
+    """Test cases for step lookups on Procedure."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.procedure = Procedure(
+            name="Deploy",
+            steps=[ProcedureStep(id="s1", action="old"), ProcedureStep(id="s2", action="ship")],
+        )
+
+    def test_reassigned_steps_are_used(self):
+        """Reassigning steps to a list with the same ids returns the new steps."""
+        self.assertEqual(self.procedure.get_step("s1").action, "old")
+
+        self.procedure.steps = [ProcedureStep(id="s1", action="new"), ProcedureStep(id="s2", action="ship")]
+
+        self.assertEqual(self.procedure.get_step("s1").action, "new")
+
+    def test_replaced_and_removed_steps(self):
+        """Steps replaced in place are found and removed steps are not."""
+        self.procedure.get_step("s1")
+        self.procedure.steps[0] = ProcedureStep(id="s1", action="replaced")
+        self.assertEqual(self.procedure.get_step("s1").action, "replaced")
+
+        del self.procedure.steps[0]
+        self.assertIsNone(self.procedure.get_step("s1"))
+        self.assertEqual(self.procedure.get_step("s2").action, "ship")
+
+
+class TestProcedureRegistryIndex(unittest.TestCase):
+    """Test cases for the lookup indexes of ProcedureRegistry."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.registry = ProcedureRegistry(self._tmp.name)
+
+    def register(self, name, domain, description=""):
+        return self.registry.register(
+            Procedure(name=name, domain=domain, description=description)
+        )
+
+    def names(self, procedures):
+        return [proc.name for proc in procedures]
+
+    def test_lookups_return_registration_order(self):
+        """Domain, name and text lookups keep the order procedures were registered in."""
+        self.register("Deploy service", "ops")
+        self.register("Close books", "finance", "Monthly deploy of ledgers")
+        self.register("Rollback deploy", "ops")
+
+        self.assertEqual(self.names(self.registry.find_by_domain("ops")), ["Deploy service", "Rollback deploy"])
+        self.assertEqual(self.names(self.registry.find_by_name("DEPLOY")), ["Deploy service", "Rollback deploy"])
+        self.assertEqual(
+            self.names(self.registry.search("deploy")),
+            ["Deploy service", "Close books", "Rollback deploy"],
+        )
+        self.assertEqual(self.names(self.registry.search("fin")), ["Close books"])
+        self.assertEqual(self.names(self.registry.find_by_name("ro")), ["Rollback deploy"])
+        self.assertEqual(self.registry.search("missing"), [])
+
+    def test_reregister_after_edit_moves_indexes(self):
+        """Editing a procedure and registering it again replaces its index entries."""
+        proc = self.register("Deploy service", "ops")
+        proc.domain = "release"
+        proc.name = "Ship service"
+        self.registry.register(proc)
+
+        self.assertEqual(self.registry.find_by_domain("ops"), [])
+        self.assertEqual(self.names(self.registry.find_by_domain("release")), ["Ship service"])
+        self.assertEqual(self.registry.find_by_name("deploy"), [])
+        self.assertEqual(self.names(self.registry.search("ship")), ["Ship service"])
+
+    def test_edits_are_found_after_reindex(self):
+        """Edits are not found by lookups until the procedure is reindexed."""
+        proc = self.register("Deploy service", "ops")
+        updated_at = proc.updated_at
+        proc.domain = "release"
+        proc.name = "Ship service"
+
+        self.assertEqual(self.names(self.registry.find_by_domain("ops")), ["Ship service"])
+        self.assertEqual(self.registry.find_by_name("ship"), [])
+
+        self.assertTrue(self.registry.reindex(proc.id))
+
+        self.assertEqual(self.registry.find_by_domain("ops"), [])
+        self.assertEqual(self.names(self.registry.find_by_domain("release")), ["Ship service"])
+        self.assertEqual(self.names(self.registry.find_by_name("ship")), ["Ship service"])
+        self.assertEqual(self.registry.search("deploy"), [])
+        self.assertEqual(proc.updated_at, updated_at)
+        self.assertFalse(self.registry.reindex("missing"))
+
+    def test_delete_after_edit_clears_indexes(self):
+        """Deleting a procedure edited since registration leaves no stale entries."""
+        proc = self.register("Deploy service", "ops")
+        proc.domain = "release"
+
+        self.assertTrue(self.registry.delete(proc.id))
+
+        self.assertEqual(self.registry.find_by_domain("ops"), [])
+        self.assertEqual(self.registry.find_by_domain("release"), [])
+        self.assertEqual(self.registry.search("deploy"), [])
+
+
+class TestProcedureRegistryLazyLoading(unittest.TestCase):
+    """Test cases for parsing stored procedures on first access."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = self._tmp.name
+        writer = ProcedureRegistry(self.path)
+        self.deploy = writer.register(Procedure(
+            name="Deploy",
+            domain="ops",
+            steps=[ProcedureStep(order=1, action="build"), ProcedureStep(order=2, action="ship")],
+        ))
+        self.close = writer.register(Procedure(name="Close books", domain="finance"))
+
+    def test_get_parses_only_requested_procedure(self):
+        """Looking up one id leaves the other stored files unparsed."""
+        registry = ProcedureRegistry(self.path)
+        self.assertFalse(registry.is_empty())
+
+        proc = registry.get(self.deploy.id)
+
+        self.assertEqual([step.action for step in proc.steps], ["build", "ship"])
+        self.assertEqual(registry.get(self.deploy.id).created_at, self.deploy.created_at)
+        self.assertEqual(list(registry._procedures), [self.deploy.id])
+
+    def test_lookups_load_everything(self):
+        """Queries over all procedures parse the remaining files first."""
+        registry = ProcedureRegistry(self.path)
+
+        self.assertEqual([p.name for p in registry.find_by_domain("finance")], ["Close books"])
+        self.assertEqual(
+            sorted(p.name for p in registry.list_all()),
+            ["Close books", "Deploy"],
+        )
+
+    def test_file_named_differently_is_found(self):
+        """A procedure stored under another file name is found by its id."""
+        data = json.loads(Path(self.path, f"{self.close.id}.json").read_text())
+        data.update(id="legacy-id", created_at="2024-01-02T03:04:05")
+        Path(self.path, "legacy.json").write_text(json.dumps(data))
+
+        proc = ProcedureRegistry(self.path).get("legacy-id")
+
+        self.assertEqual(proc.name, "Close books")
+        self.assertEqual(proc.created_at.isoformat(), "2024-01-02T03:04:05")
+
+    def test_registered_version_wins_over_stored_file(self):
+        """Registering before the stored file is parsed keeps the new version."""
+        registry = ProcedureRegistry(self.path)
+        registry.register(Procedure(id=self.deploy.id, name="Deploy v2", domain="ops"))
+
+        self.assertEqual([p.name for p in registry.find_by_domain("ops")], ["Deploy v2"])
+        self.assertEqual(ProcedureRegistry(self.path).get(self.deploy.id).name, "Deploy v2")
+
+    def test_unreadable_file_is_skipped(self):
+        """A corrupt file is reported and does not block the other procedures."""
+        Path(self.path, "broken.json").write_text("{not json")
+        registry = ProcedureRegistry(self.path)
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            names = sorted(p.name for p in registry.list_all())
+
+        self.assertEqual(names, ["Close books", "Deploy"])
+        self.assertIn("broken.json", output.getvalue())
+
+    def test_delete_unparsed_procedure(self):
+        """Deleting a procedure that was never parsed removes its file."""
+        registry = ProcedureRegistry(self.path)
+
+        self.assertTrue(registry.delete(self.deploy.id))
+
+        self.assertFalse(Path(self.path, f"{self.deploy.id}.json").exists())
+        self.assertIsNone(ProcedureRegistry(self.path).get(self.deploy.id))
+
+
+class TestProceduralKnowledgeGuidance(unittest.TestCase):
+    """Test cases for step guidance in ProceduralKnowledge."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.knowledge = ProceduralKnowledge(self._tmp.name)
+        self.procedure = self.knowledge.registry.register(Procedure(
+            name="Deploy",
+            steps=[
+                ProcedureStep(id="a", order=1, action="build"),
+                ProcedureStep(id="b", order=2, action="ship"),
+            ],
+        ))
+
+    def actions(self):
+        return [step["action"] for step in self.knowledge.get_guidance(self.procedure.id)]
+
+    def test_guidance_follows_step_order(self):
+        """Guidance lists steps by order, including edits made after registering."""
+        self.assertEqual(self.actions(), ["build", "ship"])
+
+        self.procedure.steps[0].order = 3
+        self.assertEqual(self.actions(), ["ship", "build"])
+
+        self.procedure.steps = [
+            ProcedureStep(id="c", order=2, action="verify"),
+            ProcedureStep(id="d", order=1, action="plan"),
+        ]
+        self.assertEqual(self.actions(), ["plan", "verify"])
+
+    def test_next_step_skips_completed_steps(self):
+        """The next step is the lowest-ordered step not completed yet."""
+        self.assertEqual(self.knowledge.get_next_step(self.procedure.id, [])["step_id"], "a")
+        self.assertEqual(self.knowledge.get_next_step(self.procedure.id, ["a"])["step_id"], "b")
+        self.assertIsNone(self.knowledge.get_next_step(self.procedure.id, ["a", "b"]))
+
+        self.procedure.steps[1].order = 0
+        self.assertEqual(self.knowledge.get_next_step(self.procedure.id, [])["step_id"], "b")
+
+    def test_equal_orders_keep_list_order(self):
+        """Steps with the same order are returned in list order."""
+        self.procedure.steps.append(ProcedureStep(id="c", order=1, action="lint"))
+
+        self.assertEqual(self.actions(), ["build", "lint", "ship"])
+        self.assertEqual(self.knowledge.get_next_step(self.procedure.id, ["a"])["step_id"], "c")
+
+
+if __name__ == "__main__":
+    unittest.main()
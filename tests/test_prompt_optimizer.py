@@ -0,0 +1,68 @@
+"""Unit tests for prompt templates."""
+
+import unittest
+
+from multi_agent_system.enterprise.prompt_optimizer import PromptTemplate
+
+
+class TestPromptTemplateRender(unittest.TestCase):
+    """Test cases for cached template rendering."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.values = {"name": "Ada", "count": 3, "items": ["x", "y"], "ratio": 0.5}
+
+    def assert_matches_format(self, template):
+        expected = template.format(**self.values)
+        self.assertEqual(PromptTemplate(template=template).render(**self.values), expected)
+        # Second render uses the cached segments
+        self.assertEqual(PromptTemplate(template=template).render(**self.values), expected)
+
+    def test_plain_fields_match_str_format(self):
+        """Simple {name} templates render exactly like str.format."""
+        for template in (
+            "",
+            "no fields",
+            "Hello {name}",
+            "{name} has {count} items: {items}",
+            "{name}{name}",
+            "{{literal}} {name} }}",
+        ):
+            with self.subTest(template=template):
+                self.assert_matches_format(template)
+
+    def test_complex_fields_match_str_format(self):
+        """Specs, conversions and item access fall back to str.format."""
+        for template in ("{ratio:.1%}", "{name!r}", "{items[0]}", "{count:>4}|{name}"):
+            with self.subTest(template=template):
+                self.assert_matches_format(template)
+
+    def test_errors_match_str_format(self):
+        """Missing variables and positional fields raise like str.format."""
+        with self.assertRaises(KeyError):
+            PromptTemplate(template="Hi {missing}").render(name="Ada")
+        with self.assertRaises(IndexError):
+            PromptTemplate(template="Hi {0}").render(name="Ada")
+        with self.assertRaises(ValueError):
+            PromptTemplate(template="Hi {name").render(name="Ada")
+
+    def test_edited_template_is_reparsed(self):
+        """Changing .template after rendering uses the new text."""
+        prompt = PromptTemplate(template="Hello {name}")
+        self.assertEqual(prompt.render(name="Ada"), "Hello Ada")
+
+        prompt.template = "Bye {name}"
+
+        self.assertEqual(prompt.render(name="Ada"), "Bye Ada")
+
+    def test_get_variables(self):
+        """Variables are listed in order of appearance, repeats included."""
+        prompt = PromptTemplate(template="{name} and {count}, again {name}")
+
+        self.assertEqual(prompt.get_variables(), ["name", "count", "name"])
+        prompt.get_variables().append("changed")
+        self.assertEqual(prompt.get_variables(), ["name", "count", "name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+"""Unit tests for RAG knowledge sources."""
+
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from multi_agent_system.enterprise.rag import (
+    KnowledgeAugmentation,
+    KnowledgeGraphSource,
+    KnowledgeSource,
+    PaperRepositorySource,
+    RetrievedChunk,
+)
+
+
+class CountingSource(KnowledgeSource):
+    """Source returning one chunk per query and counting batch calls."""
+
+    def __init__(self):
+        self.batch_calls = 0
+
+    def retrieve(self, query, top_k=5):
+        return [RetrievedChunk(id=f"c-{query}", content=query, source="counting", score=0.5)]
+
+    def retrieve_batch(self, queries, top_k=5):
+        self.batch_calls += 1
+        return super().retrieve_batch(queries, top_k)
+
+
+class TestPaperRepositorySource(unittest.TestCase):
+    """Test cases for keyword retrieval over the paper repository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.papers = [
+            {"id": "p1", "title": "Retrieval-Augmented Generation", "summary": "RAG for QA.", "authors": ["Lewis"]},
+            {"id": "p2", "title": "Graph neural networks", "summary": "Message passing.", "authors": ["Kipf"]},
+            {"id": "p3", "title": "Dense retrieval", "summary": "Dual encoders for retrieval.", "authors": ["Karpukhin"]},
+        ]
+        self.source = self.make_source(self.papers)
+
+    def make_source(self, papers):
+        path = Path(self._tmp.name) / "papers.json"
+        path.write_text(json.dumps(papers))
+        return PaperRepositorySource(str(path))
+
+    def ranked(self, query, top_k=5):
+        return [(chunk.id, chunk.score) for chunk in self.source.retrieve(query, top_k)]
+
+    def test_scores_count_matching_query_words(self):
+        """Each query word found in a paper adds one point; ties keep file order."""
+        self.assertEqual(self.ranked("retrieval generation"), [("p1", 2.0), ("p3", 1.0)])
+        self.assertEqual(self.ranked("RETRIEVAL"), [("p1", 1.0), ("p3", 1.0)])
+
+    def test_words_match_inside_longer_words_and_punctuation(self):
+        """Query words are substrings, not whole tokens."""
+        self.assertEqual(self.ranked("augmented-gen"), [])
+        self.assertEqual(self.ranked("augment"), [("p1", 1.0)])
+        self.assertEqual(self.ranked("qa."), [("p1", 1.0)])
+        self.assertEqual(self.ranked("kip"), [("p2", 1.0)])
+
+    def test_repeated_and_short_words(self):
+        """Repeated query words count each time, and short words still match."""
+        self.assertEqual(self.ranked("graph graph"), [("p2", 2.0)])
+        self.assertEqual(self.ranked("qa"), [("p1", 1.0)])
+
+    def test_top_k_and_chunk_content(self):
+        """Only top_k results are built, with the paper details in the chunk."""
+        chunks = self.source.retrieve("retrieval", top_k=1)
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].source, "papers")
+        self.assertTrue(chunks[0].content.startswith("Title: Retrieval-Augmented Generation\nAuthors: Lewis"))
+
+    def test_missing_file_returns_nothing(self):
+        """A source without a papers file retrieves nothing."""
+        source = PaperRepositorySource(str(Path(self._tmp.name) / "missing.json"))
+
+        self.assertEqual(source.retrieve("retrieval"), [])
+
+    def test_matches_linear_scan(self):
+        """Indexed retrieval ranks like scanning every paper for every word."""
+        rng = random.Random(7)
+        alphabet = "abcde -"
+        papers = [
+            {"id": str(i), "title": "".join(rng.choice(alphabet) for _ in range(30)), "summary": "", "authors": []}
+            for i in range(60)
+        ]
+        self.source = self.make_source(papers)
+
+        for _ in range(50):
+            query = " ".join(
+                "".join(rng.choice("abcde") for _ in range(rng.randint(1, 4)))
+                for _ in range(rng.randint(1, 4))
+            )
+            words = query.split()
+            scored = []
+            for paper in papers:
+                score = sum(1.0 for word in words if word in paper["title"])
+                if score:
+                    scored.append((paper["id"], score))
+            scored.sort(key=lambda item: item[1], reverse=True)
+
+            self.assertEqual(self.ranked(query, top_k=5), scored[:5], query)
+
+
+class TestKnowledgeGraphSource(unittest.TestCase):
+    """Test cases for keyword retrieval over knowledge graph entities."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        path = Path(self._tmp.name) / "entities.json"
+        path.write_text(json.dumps([
+            {"id": "e1", "name": "Transformer", "description": "Attention-based model", "type": "model"},
+            {"id": "e2", "name": "BERT", "description": "Transformer encoder", "type": "model"},
+        ]))
+        self.source = KnowledgeGraphSource(str(path))
+
+    def test_entities_match_name_and_description(self):
+        """Entities are scored on their name and description."""
+        chunks = self.source.retrieve("transformer encoder")
+
+        self.assertEqual([(c.id, c.score) for c in chunks], [("e2", 2.0), ("e1", 1.0)])
+        self.assertEqual(chunks[0].content, "BERT: Transformer encoder")
+        self.assertEqual(chunks[0].metadata, {"type": "model"})
+
+
+class TestBatchRetrieval(unittest.TestCase):
+    """Test cases for batch retrieval and prompt augmentation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        papers = Path(self._tmp.name) / "papers.json"
+        papers.write_text(json.dumps([
+            {"id": "p1", "title": "Retrieval-Augmented Generation", "summary": "RAG for QA.", "authors": ["Lewis"]},
+            {"id": "p2", "title": "Dense retrieval", "summary": "Dual encoders.", "authors": ["Karpukhin"]},
+        ]))
+        entities = Path(self._tmp.name) / "entities.json"
+        entities.write_text(json.dumps([
+            {"id": "e1", "name": "Transformer", "description": "Attention-based model", "type": "model"},
+            {"id": "e2", "name": "Retriever", "description": "Dense retrieval model", "type": "model"},
+        ]))
+        self.counting = CountingSource()
+        self.augmentation = KnowledgeAugmentation()
+        self.augmentation.sources = {}
+        self.augmentation.register_source("papers", PaperRepositorySource(str(papers)))
+        self.augmentation.register_source("knowledge_graph", KnowledgeGraphSource(str(entities)))
+        self.augmentation.register_source("counting", self.counting)
+        self.queries = ["dense retrieval", "transformer", "nothing here", "retrieval"]
+
+    def summary(self, context):
+        return context.query, [(c.id, c.score) for c in context.chunks], context.total_chunks
+
+    def test_source_batch_matches_single_retrieval(self):
+        """KnowledgeSource.retrieve_batch returns retrieve() results in query order."""
+        source = self.augmentation.sources["papers"]
+
+        self.assertEqual(
+            source.retrieve_batch(self.queries, top_k=1),
+            [source.retrieve(query, top_k=1) for query in self.queries],
+        )
+
+    def test_batch_matches_single_retrieval(self):
+        """Batch contexts equal per-query retrieve() results, including source filters."""
+        for sources in (None, ["papers"], ["knowledge_graph", "missing"]):
+            with self.subTest(sources=sources):
+                batch = self.augmentation.retrieve_batch(self.queries, sources, top_k=2)
+                self.assertEqual(
+                    [self.summary(c) for c in batch],
+                    [self.summary(self.augmentation.retrieve(q, sources, top_k=2)) for q in self.queries],
+                )
+
+    def test_each_source_is_called_once_per_batch(self):
+        """Every source receives all queries in a single call."""
+        self.augmentation.retrieve_batch(self.queries)
+
+        self.assertEqual(self.counting.batch_calls, 1)
+        self.assertEqual(self.augmentation.retrieve_batch([]), [])
+
+    def test_augment_prompts_match_single_augmentation(self):
+        """Batch augmentation gives the same prompts as augment_prompt per query."""
+        prompts = [f"Answer: {query}" for query in self.queries]
+
+        self.assertEqual(
+            self.augmentation.augment_prompts(self.queries, prompts, max_context=200),
+            [
+                self.augmentation.augment_prompt(query, prompt, max_context=200)
+                for query, prompt in zip(self.queries, prompts)
+            ],
+        )
+
+    def test_augment_prompts_rejects_mismatched_lengths(self):
+        """Queries and prompts must pair up one to one."""
+        with self.assertRaises(ValueError):
+            self.augmentation.augment_prompts(["a", "b"], ["only one"])
+        with self.assertRaises(ValueError):
+            self.augmentation.augment_prompts([], ["extra"])
+
+
+if __name__ == "__main__":
+    unittest.main()